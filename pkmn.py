@@ -1,42 +1,71 @@
-import pandas as pd
-import random
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import logging
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-import mplcursors  # Import mplcursors for interactive hover labels
-from PIL import Image, ImageTk  # Pillow for handling images
-
-
-# Load evolution level into data frame 
-evol_df = pd.read_excel("Data/evols.xlsx")
-evol_df.columns = evol_df.columns.str.strip().str.lower()
-
-# Helper to check if Pokémon is available at or below level
-valid_pokemon_names_by_level = set()
-for _, row in evol_df.iterrows():
-    if row['level'] <= 100:
-        valid_pokemon_names_by_level.add(row['evolving from'].lower())
-        valid_pokemon_names_by_level.add(row['evolving to'].lower())
-
-
-# Create a lookup to get the max evolved form by a given level and final form
-def get_final_evolution(name, max_level):
-    current = name.lower()
-    while True:
-        evolutions = evol_df[(evol_df['evolving from'].str.lower() == current) & (evol_df['level'] <= max_level)]
-        if evolutions.empty:
-            return current
-        current = evolutions.iloc[0]['evolving to'].lower()
-# Check if a Pokémon is valid under a given level
-def is_pokemon_available_by_level(name, max_level):
-    name = name.lower()
-    for _, row in evol_df.iterrows():
-        evolving_to = row['evolving to']
-        if pd.isna(evolving_to):
-            continue
-        if evolving_to.lower() == name and row['level'] > max_level:
-            return False
-    return True
+from teambuilder import configure_logging
+from teambuilder.jobs import JobRunner
+
+# pandas/numpy (via the engine), matplotlib, mplcursors and PIL are imported
+# lazily: the engine by the background load job, plotting on the first
+# analysis, PIL only when the scaled background image has to be rebuilt.
+engine = search = sampling = pareto = None
+pokedex = df = team_state = sample_rng = None
+
+POLL_INTERVAL_MS = 100
+WINDOW_SIZE = (1000, 750)
+BACKGROUND_IMAGE = os.path.join("Data", "pika.jpg")
+ACTION_LABELS = {"generate": "Generating team", "optimize": "Optimizing team", "sample": "Drawing a random team",
+                 "pareto": "Computing Pareto front",
+                 "swap": "Finding a swap", "analyze": "Analyzing team",
+                 "load": "Loading Pokédex", "background": "Loading background"}
+# Startup phases are kept out of the Cancel button
+BACKGROUND_ACTIONS = ("load", "background")
+# Set once the window is going away, so poll_jobs stops rescheduling itself
+closing = False
+log = logging.getLogger("teambuilder.gui")
+startup_phases = [("imports", time.perf_counter())]
+
+
+# Record the end of a startup phase for --startup-report
+def mark_phase(name):
+    startup_phases.append((name, time.perf_counter()))
+    if args.startup_report and name in ("data loaded", "first frame") and \
+            {"data loaded", "first frame"} <= {phase for phase, _ in startup_phases}:
+        print_startup_report()
+def print_startup_report():
+    print("Startup timing (ms since launch / since previous phase):")
+    previous = STARTED
+    for name, stamp in startup_phases:
+        print(f"  {name:<18} {1000 * (stamp - STARTED):8.1f} {1000 * (stamp - previous):8.1f}")
+        previous = stamp
+
+
+# Read the generation/level/stat/type filters from the Tk controls
+def read_filters():
+    """Return the current GUI filters as engine keyword arguments."""
+    generation_text = gen_var.get().strip()
+    level_text = level_var.get().strip()
+    if not generation_text.isdigit():
+        raise ValueError("Please enter a valid numerical value for Generation (1-8).")
+    if not level_text:
+        raise ValueError("Max level is required.")
+    return {
+        "generation": int(generation_text),
+        "max_level": int(level_text),
+        "prioritized_stat": stat_var.get(),
+        "preferred_types": [t for t, var in type_vars.items() if var.get() == 1],
+        "excluded_types": [t for t, var in excluded_type_vars.items() if var.get() == 1],
+    }
+# The team shown in the table, kept in step with team_tree by team_state
+def current_team():
+    """Return the team in the table as PokemonRecords."""
+    return team_state.members()
 # Add specific pokemon by name to team
 def manually_add_pokemon():
     """Allow the user to manually add a Pokémon to the team."""
@@ -45,17 +74,25 @@ def manually_add_pokemon():
         messagebox.showinfo("No Selection", "Please enter a Pokémon name.")
         return
     
-    selected_pokemon = df[df['name'].str.lower() == selected_item]
-    if selected_pokemon.empty:
-        messagebox.showinfo("Invalid Pokémon", "The Pokémon name entered is not valid.")
-        return
+    pokemon = engine.find_pokemon(pokedex, selected_item)
+    if pokemon is None:
+        # Offer the closest name for typos instead of rejecting outright
+        close = engine.suggest_pokemon(pokedex, selected_item, limit=1)
+        if not close or not messagebox.askyesno("Invalid Pokémon", f"No Pokémon named '{selected_item}'. "
+                                                f"Did you mean {close[0].name}?"):
+            return
+        pokemon = close[0]
     
     # Add to team
-    pokemon = selected_pokemon.iloc[0]
-    team_tree.insert("", "end", values=(pokemon['name'], pokemon['type1'], pokemon['type2'], 
-                                        pokemon['hp'], pokemon['attack'], 
-                                        pokemon['defense'], pokemon['speed']))
-    messagebox.showinfo("Pokémon Added", f"{pokemon['name']} has been added to your team!")
+    item = team_tree.insert("", "end", values=engine.team_row(pokemon))
+    team_state.add(pokemon, key=item)
+    manual_selection.set("")
+    messagebox.showinfo("Pokémon Added", f"{pokemon.name} has been added to your team!")
+# Refresh the manual entry's dropdown with the best matches for what has been typed so far
+def update_suggestions(*_):
+    if pokedex is None:
+        return
+    manual_entry["values"] = [pokemon.name for pokemon in engine.suggest_pokemon(pokedex, manual_selection.get())]
 # Remove specific selected/highlighted pokemon name from team
 def remove_pokemon():
     """Remove the selected Pokémon from the team."""
@@ -64,6 +101,8 @@ def remove_pokemon():
         messagebox.showinfo("No Selection", "Please select a Pokémon to remove.")
         return
 
+    for item in selected_item:
+        team_state.remove(item)
     team_tree.delete(selected_item)
     messagebox.showinfo("Pokémon Removed", "The selected Pokémon has been removed from your team.")
 # Export team to csv with data
@@ -77,7 +116,8 @@ def save_team():
     for row in team_tree.get_children():
         team_list.append(team_tree.item(row)['values'])
     
-    team_df = pd.DataFrame(team_list, columns=["Name", "Type 1", "Type 2", "HP", "Attack", "Defense", "Speed"])
+    import pandas as pd  # already loaded by the engine
+    team_df = pd.DataFrame(team_list, columns=engine.TEAM_COLUMNS)
     team_df.to_csv("saved_team.csv", index=False)
     messagebox.showinfo("Team Saved", "Your team has been saved as 'selected_team.csv'.")
 # Swap currently selected/highlighted pokemon with alternative that meets or is close to criteria
@@ -88,157 +128,124 @@ def swap_pokemon():
         return
 
     try:
-        generation = int(gen_var.get())
-        max_level = int(level_var.get())
+        filters = read_filters()
     except ValueError:
         messagebox.showerror("Invalid Input", "Please enter valid values for generation and level.")
         return
+    filters.pop("preferred_types")
 
-    prioritized_stat = stat_var.get().lower() if stat_var.get() and stat_var.get().lower() != "none" else None
-    preferred_types = [t for t, var in type_vars.items() if var.get() == 1]
-    excluded_types = [t for t, var in excluded_type_vars.items() if var.get() == 1]
+    item = selected_item[0]
+    slot = team_tree.index(item)
 
-    current_team_names = [team_tree.item(i)['values'][0].lower() for i in team_tree.get_children()]
-    type_counts = {}
-    for i in team_tree.get_children():
-        t1 = team_tree.item(i)['values'][1].lower()
-        t2 = team_tree.item(i)['values'][2].lower() if team_tree.item(i)['values'][2] else None
-        for t in [t1, t2]:
-            if t:
-                type_counts[t] = type_counts.get(t, 0) + 1
-
-    filtered_df = filter_by_generation(df, generation)
-    if prioritized_stat in filtered_df.columns:
-        filtered_df = filtered_df.sort_values(by=prioritized_stat, ascending=False)
+    def done(new_team):
+        if new_team is None:
+            messagebox.showinfo("No Swap Available", "No suitable Pokémon found to swap in with current filters.")
+            return
+        if not team_tree.exists(item):
+            return  # the row was removed while the search ran
 
-    for _, pokemon in filtered_df.iterrows():
-        name = pokemon['name'].lower()
-        final_name = get_final_evolution(name, max_level)
-        final_pokemon = df[df['name'].str.lower() == final_name]
-        if final_pokemon.empty:
-            continue
+        # Found valid replacement
+        team_state.swap(item, new_team[slot])
+        values = engine.team_row(new_team[slot])
+        team_tree.item(item, values=values)
+        messagebox.showinfo("Pokémon Swapped", f"Swapped Pokémon with {values[0]}.")
 
-        pokemon = final_pokemon.iloc[0]
-        if not is_pokemon_available_by_level(pokemon['name'], max_level):
-            continue
+    start_job("swap", lambda team: engine.swap_pokemon(pokedex, team, slot, **filters), current_team(), on_done=done)
+# Generate team that meets preferred options
+def generate_team():
+    try:
+        filters = read_filters()
+    except ValueError as ve:
+        messagebox.showerror("Invalid Input", str(ve))
+        return
 
-        if pokemon['name'].lower() in current_team_names:
-            continue
+    start_job("generate", lambda: engine.generate_team(pokedex, **filters), on_done=show_team)
+# Search every valid team for the best stat/coverage/weakness balance
+def optimize_team():
+    try:
+        filters = read_filters()
+    except ValueError as ve:
+        messagebox.showerror("Invalid Input", str(ve))
+        return
 
-        if pokemon['type1'] in excluded_types or pokemon['type2'] in excluded_types:
-            continue
+    start_job("optimize", lambda: search.optimize_team(pokedex, **filters), on_done=show_optimized_team)
+# Draw a random type-diverse team weighted by the prioritized stat; each click gives a new one
+def sample_team():
+    try:
+        filters = read_filters()
+    except ValueError as ve:
+        messagebox.showerror("Invalid Input", str(ve))
+        return
 
-        if type_counts.get(pokemon['type1'], 0) >= 2 or (pokemon['type2'] and type_counts.get(pokemon['type2'], 0) >= 2):
-            continue
+    start_job("sample", lambda: sampling.sample_team(pokedex, seed=sample_rng, **filters), on_done=show_team)
+# Trade-off teams across several stats and type coverage, browsed in their own window
+def pareto_front():
+    try:
+        filters = read_filters()
+    except ValueError as ve:
+        messagebox.showerror("Invalid Input", str(ve))
+        return
 
-        # Found valid replacement
-        team_tree.item(selected_item, values=(pokemon['name'], pokemon['type1'], pokemon['type2'], 
-                                              pokemon['hp'], pokemon['attack'], 
-                                              pokemon['defense'], pokemon['speed']))
-        messagebox.showinfo("Pokémon Swapped", f"Swapped Pokémon with {pokemon['name']}.")
+    start_job("pareto", lambda: pareto.pareto_front(pokedex, filters["generation"], filters["max_level"],
+                                                     excluded_types=filters["excluded_types"]),
+              on_done=show_pareto_front)
+def show_pareto_front(front):
+    if not front["teams"]:
+        messagebox.showinfo("No Pokémon Found", "No Pokémon match the selected criteria. Try adjusting the filters.")
         return
 
-    messagebox.showinfo("No Swap Available", "No suitable Pokémon found to swap in with current filters.")
-# Generate team that meets preferred options
-def generate_team():
-    global team
-    try:
-        generation_text = gen_var.get().strip()
-        level_text = level_var.get().strip()
-
-        try:
-            generation = int(gen_var.get())
-            level_text = level_var.get().strip()
-            if not level_text:
-                raise ValueError("Max level is required.")
-            max_level = int(level_text)
-        except ValueError as ve:
-            messagebox.showerror("Invalid Input", str(ve))
+    window = tk.Toplevel(root)
+    kind = "approximate, truncated by the beam" if front["stats"]["truncated"] else "exact"
+    window.title(f"Pareto Front ({len(front['teams'])} teams, {kind})")
+    names = [name.replace("_", " ").title() for name in front["objectives"]]
+    tree = ttk.Treeview(window, columns=names + ["Team"], show="headings", height=15)
+    for name in names:
+        tree.heading(name, text=name)
+        tree.column(name, width=80, anchor="e")
+    tree.heading("Team", text="Team")
+    tree.column("Team", width=520)
+    scrollbar = ttk.Scrollbar(window, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    for i, entry in enumerate(front["teams"]):
+        tree.insert("", "end", iid=str(i),
+                    values=entry["objectives"] + [", ".join(pokemon.name for pokemon in entry["team"])])
+
+    def use_team(*_):
+        selected = tree.selection()
+        if not selected:
+            messagebox.showinfo("No Selection", "Please select a team from the front.", parent=window)
             return
-    
-        if not generation_text.isdigit():
-            raise ValueError("Invalid numerical input.")
-
-        
-        generation = int(generation_text)
-        max_level = int(level_text)
-
-        if generation < 1 or generation > 8:
-            raise ValueError("Generation must be between 1 and 8.")
-        
-        prioritized_stat = stat_var.get().lower() if stat_var.get() else None
-        if prioritized_stat == "none":
-            prioritized_stat == None
-        preferred_types = [t for t, var in type_vars.items() if var.get() == 1] if type_vars else []
-        excluded_types = [t for t, var in excluded_type_vars.items() if var.get() == 1] if excluded_type_vars else []
-        
-        filtered_df = filter_by_generation(df, generation)
-        
-        if filtered_df.empty:
-            messagebox.showinfo("No Pokémon Found", "No Pokémon match the selected criteria. Try adjusting the filters.")
-            return
-        
-        team = select_custom_team(filtered_df, prioritized_stat, preferred_types, excluded_types, max_level)
-        
-        for row in team_tree.get_children():
-            team_tree.delete(row)
-        
-        for _, pokemon in team.iterrows():
-            team_tree.insert("", "end", values=(pokemon['name'], pokemon['type1'], pokemon['type2'], 
-                                                 pokemon['hp'], pokemon['attack'], 
-                                                 pokemon['defense'], pokemon['speed']))
-    except ValueError:
-        messagebox.showerror("Error", "Please enter a valid numerical value for Generation (1-8).")
-# Load dataframe with pkmn data from csv
-def load_pokemon_data(file_path):
-    """Load and clean the Pokémon dataset."""
-    df = pd.read_csv(file_path)
-    df.columns = df.columns.str.strip().str.lower()  # Ensure all columns are lowercase
-    return df
-# Filter DataFrame Pokémon by generation to isolate only pokemon from a specific gen
-def filter_by_generation(df, generation):
-    """Filter Pokémon by generation."""
-    return df[df['generation'] == generation]
-# Select a team of Pokémon based on filters and level using new selected gen
-def select_custom_team(df, prioritize_stat=None, preferred_types=None, excluded_types=None, max_level=None):
-    if df.empty:
-        return pd.DataFrame()
-
-    if prioritize_stat and prioritize_stat in df.columns:
-        df = df.sort_values(by=prioritize_stat, ascending=False)
-
-    team = []
-    used_types = set()
-
-    for _, pokemon in df.iterrows():
-        name = pokemon['name'].lower()
-        final_name = get_final_evolution(name, max_level) if max_level is not None else name
-        final_pokemon = df[df['name'].str.lower() == final_name]
-        if final_pokemon.empty:
-            continue
-
-        pokemon = final_pokemon.iloc[0]
-
-        if max_level is not None and not is_pokemon_available_by_level(pokemon['name'], max_level):
-            continue
-
-        pokemon_types = {pokemon['type1'], pokemon.get('type2', None)}
-
-        if excluded_types and (pokemon['type1'] in excluded_types or pokemon['type2'] in excluded_types):
-            continue
-
-        if not used_types.intersection(pokemon_types) or (preferred_types and (pokemon['type1'] in preferred_types or pokemon['type2'] in preferred_types)):
-            team.append(pokemon)
-            used_types.update(pokemon_types)
-        if len(team) == 6:
-            break
-
-    return pd.DataFrame(team)
+        show_team(front["teams"][int(selected[0])]["team"])
+
+    tree.bind("<Double-1>", use_team)
+    tree.grid(row=0, column=0, sticky="nsew")
+    scrollbar.grid(row=0, column=1, sticky="ns")
+    tk.Button(window, text="Use Team", command=use_team).grid(row=1, column=0, columnspan=2, pady=5)
+    window.rowconfigure(0, weight=1)
+    window.columnconfigure(0, weight=1)
+def show_optimized_team(result):
+    if show_team(result["team"]):
+        stats = result["stats"]
+        messagebox.showinfo("Optimized Team",
+                            f"Covers {result['coverage']} types, {result['shared_weaknesses']} shared weaknesses.\n"
+                            f"Searched {stats['nodes_expanded']} nodes ({stats['nodes_pruned']} pruned) "
+                            f"in {stats['seconds']:.2f}s.")
+# Replace the table contents with a team
+def show_team(team):
+    if not team:
+        messagebox.showinfo("No Pokémon Found", "No Pokémon match the selected criteria. Try adjusting the filters.")
+        return False
+
+    for row in team_tree.get_children():
+        team_tree.delete(row)
+    team_state.clear()
+
+    for pokemon in team:
+        team_state.add(pokemon, key=team_tree.insert("", "end", values=engine.team_row(pokemon)))
+    return True
 # remove every pokemon from current team
 def clear_team():
-    """Clears the entire Pokémon team from the table and resets the team dataframe."""
-    global team  # Ensure we're modifying the global team dataframe
-
+    """Clears the entire Pokémon team from the table."""
     if not team_tree.get_children():
         messagebox.showinfo("No Team Available", "There is no team to clear.")
         return
@@ -246,240 +253,176 @@ def clear_team():
     # Remove all items from the GUI table
     for row in team_tree.get_children():
         team_tree.delete(row)
-
-    # Reset the team dataframe
-    team = pd.DataFrame()
+    team_state.clear()
 
     messagebox.showinfo("Team Cleared", "Your team has been cleared successfully.")
 
 
 
-# Bar chart of average base stats by type
-def plot_type_strengths(df):
-    """Plot average base stats per Pokémon type with interactivity."""
-    type_stats = df.groupby('type1')[['hp', 'attack', 'defense', 'sp_attack', 'sp_defense', 'speed']].mean()
-    fig, ax = plt.subplots(figsize=(12, 6))
-    bars = type_stats.plot(kind='bar', ax=ax)
-    plt.title("Average Base Stats by Pokémon Type")
-    plt.xlabel("Type")
-    plt.ylabel("Average Stat Value")
-    plt.legend()
-    plt.xticks(rotation=45)
-    
-
-
-    plt.show(block=False)
-# Scatterplot of weight vs base total
-def plot_weight_vs_base_stats(df):
-    """Plot Pokémon weight vs. base stats with interactivity."""
-    if 'weight_kg' not in df.columns:
-        messagebox.showerror("Error", "Column 'weight_kg' not found in dataset.")
-        return
-    
-    df = df.dropna(subset=['weight_kg'])  # Remove rows where weight_kg is NaN
-    
-    fig, ax = plt.subplots(figsize=(10, 5))
-    scatter = ax.scatter(df['weight_kg'], df['base_total'], alpha=0.5)
-    plt.title("Weight vs Base Total Stats")
-    plt.xlabel("Weight (kg)")
-    plt.ylabel("Base Total Stats")
-    
-    # Add interactive labels
-    cursor = mplcursors.cursor(scatter, hover=True)
-    @cursor.connect("add")
-    def on_hover(sel):
-        index = sel.index
-        sel.annotation.set_text(
-            f"Name: {df.iloc[index]['name']}\nWeight: {df.iloc[index]['weight_kg']} kg\nBase Total: {df.iloc[index]['base_total']}"
-        )
-
-    plt.show(block=False)
-# Normalize and index the type chart
-def process_type_chart(chart):
-    """Process the type effectiveness chart to normalize type names."""
-    print("\n[DEBUG] Type Chart Initial Columns:", chart.columns.tolist())  # Debugging print
-
-    # Ensure the first column is actually the type names
-    if "Type" in chart.columns:
-        chart.rename(columns={"Type": "type"}, inplace=True)
-    else:
-        # Assume the first column is the type names if there's no "Type" column
-        chart.insert(0, "type", chart.index)
-        chart.reset_index(drop=True, inplace=True)
-
-    print("\n[DEBUG] Type Chart After Renaming Columns:", chart.columns.tolist())  # Debugging print
-
-    # Normalize column names
-    chart.columns = chart.columns.str.lower().str.strip()
-
-    # Ensure type names in the column are properly formatted
-    chart["type"] = chart["type"].astype(str).str.lower().str.strip()
-
-    print("\n[DEBUG] Type Chart Before Setting Index:\n", chart.head())  # Debugging print
-
-    # Ensure 'type' is used as an index
-    chart.set_index("type", inplace=True)
-
-    print("\n[DEBUG] Type Chart Index After Processing:", chart.index.tolist())  # Debugging print
-    return chart
-# Load and prepare the type effectiveness chart
-def load_type_chart(file_path):
-    """Load and debug the Pokémon type effectiveness chart."""
+# Chart data for the whole dex, aggregated on the first Analyze All and reused after
+dex_charts = None
+# Team charts get their own windows so they sit beside the full-dex ones
+TEAM_LABEL = "Team: {}"
+# Draw the stat-by-type and weight charts for one ChartData
+def plot_charts(data, team=False):
+    from teambuilder import charts
+    label = TEAM_LABEL.format if team else str
+    charts.plot_type_strengths(data, label(charts.TYPE_STRENGTHS_LABEL))
     try:
-        type_chart = pd.read_csv(file_path)
-
-        # Log raw data for verification
-        print("\n[DEBUG] Raw Type Chart Data:")
-        print(type_chart.head(10))  # Show the first 10 rows
-
-        # Log column headers before any modification
-        print("\n[DEBUG] Type Chart Columns BEFORE processing:")
-        print(type_chart.columns.tolist())
-
-        # Normalize column names (strip spaces and lowercase)
-        type_chart.columns = type_chart.columns.str.strip().str.lower()
-
-        # Log column headers after normalization
-        print("\n[DEBUG] Type Chart Columns AFTER processing:")
-        print(type_chart.columns.tolist())
-
-        # Ensure the "Type" column exists
-        if 'type' not in type_chart.columns:
-            print("\n[ERROR] 'Type' column not found in the CSV! Check formatting.")
-            return None
-
-        # Set "Type" as index for easy lookups
-        type_chart.set_index("type", inplace=True)
-
-        print("\n[INFO] Type Chart Successfully Loaded and Processed.")
-        return type_chart
-
-    except Exception as e:
-        print(f"\n[ERROR] Failed to load type chart: {e}")
-        return None
-
-type_chart = load_type_chart("Data/chart.csv")
-if type_chart is None:
-    print("[ERROR] Type Chart failed to load! Exiting...")
-    exit()
-type_chart = process_type_chart(type_chart)  # Apply normalization
-
-# Get type effectiveness row from chart safely
-def get_type_effectiveness(pokemon_type, type_chart):
-    
-
-    """Retrieve type effectiveness from the chart safely."""
-    if pd.isna(pokemon_type):  # Handle missing type
-        return None
-    pokemon_type = pokemon_type.lower().strip()  # Normalize
-    if pokemon_type not in type_chart.index:
-        print(f"[ERROR] Type '{pokemon_type}' not found in type chart!")  # Debugging
-        print("[DEBUG] Available Types in Chart:", type_chart.index.tolist())  # Log available types
-        return None
-    return type_chart.loc[pokemon_type]
-
-
-
+        charts.plot_weight_vs_base_stats(data, label(charts.WEIGHT_LABEL))
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
 # Analyze the selected team and show stats and effectiveness
 def analyze_team():
     """Analyze the selected team and generate type effectiveness details."""
-    if team.empty:
+    if not len(team_state):
         messagebox.showinfo("No Team Available", "Please generate or select a team first.")
         return
 
-    strongest_pokemon = team.loc[team['attack'].idxmax()]
-    weakest_pokemon = team.loc[team['defense'].idxmin()]
-
-    team_analysis = f"**Team Analysis & Stats**\n\n"
-    team_analysis += f"**Strongest Pokémon:** {strongest_pokemon['name']} (Attack: {strongest_pokemon['attack']})\n"
-    team_analysis += f"**Weakest Pokémon:** {weakest_pokemon['name']} (Defense: {weakest_pokemon['defense']})\n\n"
-
-    # Generate type effectiveness details
-    team_analysis += generate_team_recommendations(team, type_chart)
-
-    # Display the analysis
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.text(0, 1, team_analysis, fontsize=12, verticalalignment='top', family="monospace")
-    ax.axis("off")
-    plt.title("Team Type Effectiveness Analysis")
-    plt.show(block=False)
-
-    plot_type_strengths(team)
-    plot_weight_vs_base_stats(team)
-# Generate type matchup details for each team member
-def generate_team_recommendations(team, type_chart):
-    
-    """Analyze Pokémon team and display their type effectiveness."""
-    report = "**Team Type Effectiveness Analysis**\n\n"
-
-    for _, row in team.iterrows():
-        p_name = row["name"]
-        type1 = row["type1"]
-        type2 = row["type2"] if pd.notna(row["type2"]) else None
-
-        print(f"[DEBUG] Analyzing Pokémon: {p_name}, Type: {type1}/{type2 if type2 else ''}")
-
-        type1_effectiveness = get_type_effectiveness(type1, type_chart)
-        type2_effectiveness = get_type_effectiveness(type2, type_chart) if type2 else None
-
-        if type1_effectiveness is not None:
-            print(f"[DEBUG] {type1} Effectiveness:\n{type1_effectiveness}\n")
-
-        if type2_effectiveness is not None:
-            print(f"[DEBUG] {type2} Effectiveness:\n{type2_effectiveness}\n")
-
-        strong_against = []
-        weak_against = []
-
-        # Combine effectiveness from both types (if dual-type)
-        for t in type_chart.columns:
-            type1_value = type1_effectiveness[t] if type1_effectiveness is not None else 1
-            type2_value = type2_effectiveness[t] if type2_effectiveness is not None else 1
-            total_effectiveness = type1_value * type2_value  # Combine for dual-types
-
-            if total_effectiveness > 1:
-                strong_against.append(t)
-            elif total_effectiveness < 1:
-                weak_against.append(t)
-
-        report += f"🔹 **{p_name} ({type1}{'/' + type2 if type2 else ''})**\n"
-        report += f"   - **Strong Against:** {', '.join(strong_against) if strong_against else 'None'}\n"
-        report += f"   - **Weak Against:** {', '.join(weak_against) if weak_against else 'None'}\n\n"
-
-    print(report)  # Print report for debugging
-    return report
+    # The report comes from the running aggregates; only the plot data is built in the worker
+    team_analysis = team_state.report()
+    team = team_state.members()
+    start_job("analyze", lambda: (team_analysis, team_chart_data(team)), on_done=show_analysis)
+# Runs on a worker thread: the team's rows aggregated for plotting
+def team_chart_data(team):
+    from teambuilder.charts import ChartData
+    return ChartData(engine.team_frame(pokedex, team))
+# Plot an analysis on the Tk thread once the worker has built it
+def show_analysis(result):
+    team_analysis, team_data = result
+    from teambuilder import charts
+    charts.plot_analysis(team_analysis)
+    plot_charts(team_data, team=True)
 # Analyze all 1302 pokemon that exist via type strength charts & weight/base stat charts
 def analyze_all_pokemon():
     """Analyze all Pokémon in the dataset."""
-    plot_type_strengths(df)
-    plot_weight_vs_base_stats(df)
-
-
-df = load_pokemon_data("Data/pokemon.csv")
-team = pd.DataFrame()
+    global dex_charts
+    if dex_charts is None:
+        from teambuilder.charts import ChartData
+        dex_charts = ChartData(df)
+    plot_charts(dex_charts)
+
+
+# Run an engine call on the worker pool; the action's button is ignored while one is in flight
+def start_job(action, fn, *args, on_done, on_error=None):
+    if not jobs.submit(action, fn, *args, on_done=on_done, on_error=on_error or job_failed):
+        state = "finishing the cancelled run" if jobs.cancelling(action) else "already running"
+        status_var.set(f"{ACTION_LABELS[action]}... ({state})")
+        return
+    update_progress()
+def job_failed(error):
+    if isinstance(error, ValueError):
+        messagebox.showerror("Invalid Input", str(error))
+    else:
+        messagebox.showerror("Error", f"{type(error).__name__}: {error}")
+def cancel_jobs():
+    cancelled = [a for a in jobs.active() if a not in BACKGROUND_ACTIONS and jobs.cancel(a)]
+    update_progress()
+    if cancelled:
+        status_var.set("Cancelled " + ", ".join(ACTION_LABELS[a].lower() for a in cancelled) + ".")
+# Show what is running, start/stop the progress bar and toggle the cancel button
+def update_progress():
+    active = jobs.active()
+    if active:
+        status_var.set(" | ".join(f"{ACTION_LABELS[a]}... {jobs.elapsed(a):.1f}s" for a in active))
+        if not progress_bar.grid_info():
+            progress_bar.grid()
+            progress_bar.start(10)
+        busy = any(a not in BACKGROUND_ACTIONS for a in active)
+        cancel_button.config(state="normal" if busy else "disabled")
+    else:
+        if progress_bar.grid_info():
+            progress_bar.stop()
+            progress_bar.grid_remove()
+            status_var.set("Ready")
+        cancel_button.config(state="disabled")
+# Deliver finished background jobs on the Tk thread, then check again shortly
+def poll_jobs():
+    try:
+        jobs.poll()
+        update_progress()
+    finally:
+        if not closing:
+            root.after(POLL_INTERVAL_MS, poll_jobs)
+
+
+# Runs on a worker thread: import the engine and parse (or unpickle) the datasets
+def load_data():
+    from teambuilder import engine
+    return engine.load_pokedex()
+# Back on the Tk thread: publish the data and enable the data-driven buttons
+def data_loaded(loaded):
+    global engine, search, sampling, pareto, pokedex, df, team_state, sample_rng
+    import numpy as np
+    from teambuilder import engine, pareto, sampling, search
+    from teambuilder.teamstate import TeamState
+    pokedex = loaded
+    # One generator per session, so --seed replays the same sequence of random teams
+    sample_rng = np.random.default_rng(args.seed)
+    df = pokedex.df
+    team_state = TeamState(pokedex)
+    for button in data_buttons:
+        button.config(state="normal")
+    mark_phase("data loaded")
+# Runs inside poll_jobs, so the window is closed from the event loop once the poll returns
+def data_failed(error):
+    global closing
+    log.error("Could not load the Pokédex; exiting", exc_info=error)
+    messagebox.showerror("Error", f"Could not load the Pokédex: {error}")
+    closing = True
+    root.after_idle(on_close)
+# Decode, scale and cache the background once; later launches read the cached PNG without PIL
+def scaled_background(path, size):
+    """Return the path of a PNG copy of path scaled to size, rebuilding it only when path changes."""
+    root_name, _ = os.path.splitext(path)
+    cached = f"{root_name}.{size[0]}x{size[1]}.png"
+    if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+        return cached
+    from PIL import Image  # Pillow for handling images
+    with Image.open(path) as image:
+        image.convert("RGB").resize(size, Image.LANCZOS).save(cached)
+    return cached
+def show_background(path):
+    global bg_photo
+    bg_photo = tk.PhotoImage(file=path)
+    bg_label.config(image=bg_photo)
+    mark_phase("background shown")
+
+
+parser = argparse.ArgumentParser(description="Pokémon Team Builder")
+parser.add_argument("--startup-report", action="store_true",
+                    help="print how long each startup phase took once the window and data are ready")
+parser.add_argument("--seed", type=int, default=None, help="seed for the Random Team draws (default: random)")
+args = parser.parse_args()
+# Errors from jobs and the GUI go to stderr unless TEAMBUILDER_LOG_LEVEL already set a handler
+if not os.environ.get("TEAMBUILDER_LOG_LEVEL"):
+    configure_logging("WARNING")
 
 type_vars = {}
 excluded_type_vars = {}
+jobs = JobRunner()
 
 
 
 # === Begin Tkinter GUI ===
 root = tk.Tk()
 root.title("Pokémon Team Builder")
-root.geometry("1000x750")
+root.geometry(f"{WINDOW_SIZE[0]}x{WINDOW_SIZE[1]}")
 root.configure(bg="#4a4544")  # Light background color for a cleaner UI
 
-# === Load and Set Background Image ===
-bg_image = Image.open("Data/pika.jpg")
-bg_photo = ImageTk.PhotoImage(bg_image)
-
-bg_label = tk.Label(root, image=bg_photo)
+# === Background Image (filled in by show_background once it is scaled) ===
+bg_photo = None
+bg_label = tk.Label(root, bg="#4a4544")
 bg_label.place(relwidth=1, relheight=1)  # Covers entire window
 
 # === Title ===
 title_label = tk.Label(root, text="Pokémon Team Builder", font=("Arial", 18, "bold"), bg="#ff5859")
 title_label.grid(row=0, column=0, columnspan=3, pady=10)
-tk.Button(root, text="Analyze All Pokémon", command=lambda: [plot_type_strengths(df), plot_weight_vs_base_stats(df)]).grid(row=1, column=0, columnspan=3, pady=10)
+# Buttons that need the Pokédex stay disabled until the background load finishes
+data_buttons = []
+analyze_all_button = tk.Button(root, text="Analyze All Pokémon", command=analyze_all_pokemon, state="disabled")
+analyze_all_button.grid(row=1, column=0, columnspan=3, pady=10)
+data_buttons.append(analyze_all_button)
 
 # === Generation Selection ===
 gen_frame = ttk.LabelFrame(root, text="Select Generation")
@@ -527,9 +470,13 @@ manual_frame = ttk.LabelFrame(root, text="Manually Add Pokémon")
 manual_frame.grid(row=4, column=0, padx=10, pady=10, sticky="ew")
 
 manual_selection = tk.StringVar()
-manual_entry = tk.Entry(manual_frame, textvariable=manual_selection)
+manual_entry = ttk.Combobox(manual_frame, textvariable=manual_selection)
 manual_entry.grid(row=0, column=0, padx=10, pady=5, sticky="ew")
-tk.Button(manual_frame, text="Add Pokémon", command=lambda: print("Adding Pokémon")).grid(row=0, column=1, padx=10, pady=5)
+manual_selection.trace_add("write", update_suggestions)
+manual_entry.bind("<Return>", lambda event: manually_add_pokemon() if pokedex is not None else None)
+add_button = tk.Button(manual_frame, text="Add Pokémon", command=manually_add_pokemon, state="disabled")
+add_button.grid(row=0, column=1, padx=10, pady=5)
+data_buttons.append(add_button)
 
 # UI addition for Level input
 level_frame = ttk.LabelFrame(root, text="Max Level")
@@ -552,10 +499,15 @@ buttons = [
     ("Swap Pokémon", swap_pokemon),
     ("Remove Pokémon", remove_pokemon),
     ("Clear Team", clear_team),
+    ("Optimize Team", optimize_team),
+    ("Random Team", sample_team),
+    ("Pareto Front", pareto_front),
 ]
 
 for i, (text, command) in enumerate(buttons):
-    tk.Button(button_frame, text=text, command=command, width=15).grid(row=i // 3, column=i % 3, padx=10, pady=5)
+    button = tk.Button(button_frame, text=text, command=command, width=15, state="disabled")
+    button.grid(row=i // 3, column=i % 3, padx=10, pady=5)
+    data_buttons.append(button)
 
 # === Team Display Table ===
 team_frame = ttk.LabelFrame(root, text="Selected Pokémon Team")
@@ -570,9 +522,44 @@ for col in columns:
 
 team_tree.pack(expand=True, fill="both")
 
+# === Background Job Status ===
+status_frame = tk.Frame(root, bg="#f5f5f5")
+status_frame.grid(row=7, column=0, columnspan=3, padx=10, pady=5, sticky="ew")
+
+status_var = tk.StringVar(value="Ready")
+tk.Label(status_frame, textvariable=status_var, bg="#f5f5f5", anchor="w").grid(row=0, column=0, padx=5, sticky="w")
+progress_bar = ttk.Progressbar(status_frame, mode="indeterminate", length=200)
+progress_bar.grid(row=0, column=1, padx=5)
+progress_bar.grid_remove()
+cancel_button = tk.Button(status_frame, text="Cancel", command=cancel_jobs, state="disabled")
+cancel_button.grid(row=0, column=2, padx=5)
+status_frame.columnconfigure(0, weight=1)
+
 # Make the grid columns responsive
 root.columnconfigure(0, weight=1)
 root.columnconfigure(1, weight=1)
 root.columnconfigure(2, weight=1)
 
+def on_close():
+    global closing
+    closing = True
+    jobs.shutdown()
+    if "teambuilder.charts" in sys.modules:
+        sys.modules["teambuilder.charts"].close_all()
+    root.destroy()
+
+
+root.protocol("WM_DELETE_WINDOW", on_close)
+mark_phase("window built")
+
+# Heavy work starts once the first frame is on screen
+def first_frame():
+    mark_phase("first frame")
+    start_job("load", load_data, on_done=data_loaded, on_error=data_failed)
+    start_job("background", scaled_background, BACKGROUND_IMAGE, WINDOW_SIZE, on_done=show_background,
+              on_error=lambda error: log.warning("Could not load background image: %s", error))
+
+
+root.after_idle(first_frame)
+root.after(POLL_INTERVAL_MS, poll_jobs)
 root.mainloop()
\ No newline at end of file
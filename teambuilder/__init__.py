@@ -0,0 +1,24 @@
+"""Headless building blocks for the Pokémon Team Builder.
+
+The package logs under the ``teambuilder`` logger and is silent unless the
+application configures logging, or ``TEAMBUILDER_LOG_LEVEL`` (e.g. DEBUG)
+is set in the environment.
+"""
+import logging
+import os
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def configure_logging(level="INFO", stream=None):
+    """Send teambuilder log records at level and above to stream (stderr by default)."""
+    logger = logging.getLogger(__name__)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    return logger
+
+
+if os.environ.get("TEAMBUILDER_LOG_LEVEL"):
+    configure_logging(os.environ["TEAMBUILDER_LOG_LEVEL"])
@@ -0,0 +1,162 @@
+"""Generate teams for a whole grid of filter combinations in parallel.
+
+Each worker process loads the pokedex (and its evolution index) once in its
+initializer, then handles many grid entries. Results are streamed to a CSV or
+JSONL file (picked from the output extension) as they complete.
+
+Examples::
+
+    python -m teambuilder.batch --generations 1-8 --levels 20,40,100 \\
+        --stats attack,speed,base_total -o teams.csv
+    python -m teambuilder.batch --grid grid.jsonl --mode optimize -o teams.jsonl
+
+A grid file is a JSON list, JSONL, or CSV of entries with the keys
+``generation``, ``max_level``, ``prioritized_stat``, ``preferred_types`` and
+``excluded_types`` (types as a list, or ';'-separated in CSV).
+"""
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+
+from teambuilder import engine, search
+
+MODES = ("greedy", "optimize")
+FIELDS = ["generation", "max_level", "prioritized_stat", "preferred_types", "excluded_types",
+          "mode", "team", "error"]
+
+# Build one team for a grid entry inside a worker
+def run_job(job):
+    """Return the result row for one grid entry; errors are reported, not raised."""
+    result = dict(job, team=[], error="")
+    try:
+        filters = {key: job[key] for key in ("generation", "max_level", "prioritized_stat",
+                                             "preferred_types", "excluded_types")}
+        pokedex = engine.shared_pokedex()
+        if job["mode"] == "optimize":
+            team = search.optimize_team(pokedex, **filters)["team"]
+        else:
+            team = engine.generate_team(pokedex, **filters)
+        result["team"] = [pokemon.name for pokemon in team]
+    except ValueError as e:
+        result["error"] = str(e)
+    return result
+
+
+def _normalize_job(entry, mode):
+    return {
+        "generation": int(entry["generation"]),
+        "max_level": int(entry["max_level"]),
+        "prioritized_stat": entry.get("prioritized_stat") or None,
+        "preferred_types": engine.parse_types(entry.get("preferred_types")),
+        "excluded_types": engine.parse_types(entry.get("excluded_types")),
+        "mode": entry.get("mode") or mode,
+    }
+
+
+# Read grid entries from a JSON, JSONL or CSV file
+def read_grid(path, mode="greedy"):
+    """Yield normalized jobs from a grid file."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        if path.endswith(".csv"):
+            entries = csv.DictReader(fh)
+        elif path.endswith(".jsonl"):
+            entries = (json.loads(line) for line in fh if line.strip())
+        else:
+            entries = json.load(fh)
+        for entry in entries:
+            yield _normalize_job(entry, mode)
+
+
+def _parse_range(text):
+    values = []
+    for part in text.split(","):
+        if "-" in part:
+            low, high = part.split("-")
+            values.extend(range(int(low), int(high) + 1))
+        elif part:
+            values.append(int(part))
+    return values
+
+
+# Expand CLI flags into the cartesian grid of jobs
+def flag_grid(generations, levels, stats, preferred_types=(), excluded_types=(), mode="greedy"):
+    """Yield one job per generation × level × stat combination."""
+    for generation, level, stat in itertools.product(generations, levels, stats):
+        yield _normalize_job({"generation": generation, "max_level": level, "prioritized_stat": stat,
+                              "preferred_types": list(preferred_types), "excluded_types": list(excluded_types)},
+                             mode)
+
+
+class _Writer:
+    """Streams result rows to CSV or JSONL depending on the file extension."""
+
+    def __init__(self, fh, fmt):
+        self.fh = fh
+        self.fmt = fmt
+        if fmt == "csv":
+            self.csv = csv.DictWriter(fh, fieldnames=FIELDS)
+            self.csv.writeheader()
+
+    def write(self, row):
+        if self.fmt == "csv":
+            row = dict(row, team=";".join(row["team"]),
+                       preferred_types=";".join(row["preferred_types"]),
+                       excluded_types=";".join(row["excluded_types"]))
+            self.csv.writerow(row)
+        else:
+            self.fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+# Fan the grid out over a process pool and stream rows to the output
+def run_batch(jobs, output, workers=None, chunksize=4):
+    """Run every job and write results to output (.csv or .jsonl); returns the row count.
+
+    workers=0 runs in the current process, which is handy for debugging.
+    """
+    fmt = "csv" if str(output).endswith(".csv") else "jsonl"
+    count = 0
+    with open(output, "w", newline="", encoding="utf-8") as fh:
+        writer = _Writer(fh, fmt)
+        if workers == 0:
+            results = map(run_job, jobs)
+            for row in results:
+                writer.write(row)
+                count += 1
+            return count
+        with engine.process_pool(workers) as pool:
+            for row in pool.map(run_job, jobs, chunksize=chunksize):
+                writer.write(row)
+                count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate teams for a grid of filter combinations.")
+    parser.add_argument("--grid", help="JSON/JSONL/CSV file of grid entries (overrides the grid flags)")
+    parser.add_argument("--generations", default="1-8", help="e.g. 1-8 or 1,3,5")
+    parser.add_argument("--levels", default="100", help="max levels, e.g. 20,40,100")
+    parser.add_argument("--stats", default="none", help="prioritized stats, e.g. attack,speed,base_total")
+    parser.add_argument("--prefer", default="", help="';'-separated preferred types for every entry")
+    parser.add_argument("--exclude", default="", help="';'-separated excluded types for every entry")
+    parser.add_argument("--mode", choices=MODES, default="greedy")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores, 0: in-process)")
+    parser.add_argument("--chunksize", type=int, default=4)
+    parser.add_argument("-o", "--output", default="teams.csv", help="output file (.csv or .jsonl)")
+    args = parser.parse_args(argv)
+
+    if args.grid:
+        jobs = read_grid(args.grid, args.mode)
+    else:
+        jobs = flag_grid(_parse_range(args.generations), _parse_range(args.levels), args.stats.split(","),
+                         engine.parse_types(args.prefer), engine.parse_types(args.exclude), args.mode)
+
+    started = time.perf_counter()
+    count = run_batch(jobs, args.output, args.workers, args.chunksize)
+    print(f"Wrote {count} teams to {args.output} in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
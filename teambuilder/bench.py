@@ -0,0 +1,217 @@
+"""Reproducible benchmarks for the team-building hot paths.
+
+Runs headlessly on the bundled ``Data/`` files over every generation,
+several level caps and seeded random type filters, and reports latency
+percentiles and throughput per case. Results can be saved as a baseline and
+later runs compared against it to catch regressions::
+
+    python -m teambuilder.bench                      # run and print
+    python -m teambuilder.bench --save-baseline      # store benchmarks/baseline.json
+    python -m teambuilder.bench --check              # exit 1 if any case regressed
+
+Baselines are machine-specific; regenerate them when switching hardware.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from teambuilder import engine, search
+from teambuilder.evolution import get_final_evolution, is_pokemon_available_by_level
+
+BASELINE_PATH = Path(__file__).resolve().parent.parent / "benchmarks" / "baseline.json"
+LEVELS = (10, 20, 30, 50, 100)
+STATS = ("none", "hp", "attack", "defense", "speed", "base_total")
+DEFAULT_TOLERANCE = 0.25
+
+
+# Summarize per-call latencies (nanoseconds) into percentiles and throughput
+def summarize(latencies_ns):
+    """Return p50/p90/p99/max latency in microseconds plus calls per second."""
+    values = np.asarray(latencies_ns, dtype=float) / 1000.0
+    total_seconds = values.sum() / 1e6
+    return {
+        "calls": len(values),
+        "p50_us": float(np.percentile(values, 50)),
+        "p90_us": float(np.percentile(values, 90)),
+        "p99_us": float(np.percentile(values, 99)),
+        "max_us": float(values.max()),
+        "ops_per_sec": len(values) / total_seconds if total_seconds else float("inf"),
+    }
+
+
+def _measure(fn, calls, setup=None):
+    """Time fn(*args) for every args tuple; setup() runs untimed before each call."""
+    latencies = []
+    timer = time.perf_counter_ns
+    for args in calls:
+        if setup is not None:
+            setup()
+        started = timer()
+        fn(*args)
+        latencies.append(timer() - started)
+    return latencies
+
+
+def _random_filters(rng, count, types):
+    """Seeded generation/level/stat/type filter combinations covering every generation."""
+    filters = []
+    for i in range(count):
+        filters.append({
+            "generation": engine.GENERATIONS[i % len(engine.GENERATIONS)],
+            "max_level": LEVELS[(i // len(engine.GENERATIONS)) % len(LEVELS)],
+            "prioritized_stat": rng.choice(STATS),
+            "preferred_types": rng.sample(types, rng.choice((0, 0, 1, 2))),
+            "excluded_types": rng.sample(types, rng.choice((0, 1, 2, 3))),
+        })
+    return filters
+
+
+# Build and time every benchmark case
+def run_benchmarks(pokedex, seed=0, scale=1.0):
+    """Return {case name: summary}; scale < 1 shrinks the call counts for quick runs."""
+    rng = random.Random(seed)
+    results = {}
+
+    def count(n):
+        return max(1, int(n * scale))
+
+    names = list(pokedex.records.names)
+    evolution_calls = [(pokedex.evolution, rng.choice(names), rng.choice(LEVELS)) for _ in range(count(20000))]
+    results["get_final_evolution"] = summarize(_measure(get_final_evolution, evolution_calls))
+    results["is_pokemon_available_by_level"] = summarize(_measure(is_pokemon_available_by_level, evolution_calls))
+
+    filters = _random_filters(rng, count(400), pokedex.type_matrix.types)
+
+    def generate(f):
+        return engine.generate_team(pokedex, **f)
+
+    results["select_custom_team.cold"] = summarize(
+        _measure(generate, [(f,) for f in filters], setup=pokedex.candidates.clear))
+    # Warm: cycle through no more filter sets than the candidate cache holds, all primed first
+    warm = filters[:engine.CANDIDATE_CACHE_SIZE]
+    for f in warm:
+        generate(f)
+    warm_calls = [(warm[i % len(warm)],) for i in range(len(filters))]
+    results["select_custom_team.warm"] = summarize(_measure(generate, warm_calls))
+
+    teams = [(f, generate(f)) for f in filters]
+    swaps = [(f, team, rng.randrange(len(team))) for f, team in teams if team]
+
+    def swap(f, team, slot):
+        f = {k: v for k, v in f.items() if k != "preferred_types"}
+        return engine.swap_pokemon(pokedex, team, slot, **f)
+
+    results["swap_pokemon"] = summarize(_measure(swap, swaps))
+
+    random_teams = [(pokedex.records.take(rng.sample(range(len(names)), engine.TEAM_SIZE)), pokedex.type_matrix)
+                    for _ in range(count(2000))]
+    results["generate_team_recommendations"] = summarize(
+        _measure(engine.generate_team_recommendations, random_teams))
+
+    search_calls = [(f,) for f in filters[:count(40)]]
+
+    def optimize(f):
+        return search.optimize_team(pokedex, **f)
+
+    results["optimize_team"] = summarize(_measure(optimize, search_calls))
+    return results
+
+
+def _load_pokedex():
+    started = time.perf_counter_ns()
+    pokedex = engine.load_pokedex()
+    return pokedex, time.perf_counter_ns() - started
+
+
+# Compare a run against the saved baseline
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, quick=False):
+    """Return a list of (case, metric, baseline, current) for every regression beyond tolerance.
+
+    Quick and full runs make different numbers of calls, so a baseline recorded
+    in the other mode raises ValueError instead of being compared.
+    """
+    if bool(baseline.get("quick")) != quick:
+        raise ValueError(f"Baseline was recorded {_mode(baseline.get('quick'))}, this run is {_mode(quick)}; "
+                         "rerun in the same mode or save a new baseline.")
+    regressions = []
+    for case, current in results.items():
+        previous = baseline.get("results", {}).get(case)
+        if previous is None:
+            continue
+        if current["p50_us"] > previous["p50_us"] * (1 + tolerance):
+            regressions.append((case, "p50_us", previous["p50_us"], current["p50_us"]))
+        if current["ops_per_sec"] < previous["ops_per_sec"] / (1 + tolerance):
+            regressions.append((case, "ops_per_sec", previous["ops_per_sec"], current["ops_per_sec"]))
+    return regressions
+
+
+def _mode(quick):
+    return "with --quick" if quick else "without --quick"
+
+
+def format_table(results, baseline=None):
+    lines = [f"{'case':34} {'calls':>7} {'p50 µs':>10} {'p90 µs':>10} {'p99 µs':>10} {'max µs':>10} {'ops/s':>12}"
+             + ("  vs baseline p50" if baseline else "")]
+    for case, r in results.items():
+        line = (f"{case:34} {r['calls']:>7} {r['p50_us']:>10.1f} {r['p90_us']:>10.1f} {r['p99_us']:>10.1f} "
+                f"{r['max_us']:>10.1f} {r['ops_per_sec']:>12.1f}")
+        previous = (baseline or {}).get("results", {}).get(case)
+        if previous:
+            line += f"  {r['p50_us'] / previous['p50_us']:>6.2f}x"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark team generation, swap and analysis.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="run a tenth of the calls")
+    parser.add_argument("--baseline", default=BASELINE_PATH, type=Path, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any case regressed")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a case counts as regressed (0.25 = 25%%)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    pokedex, load_ns = _load_pokedex()
+    results = {"load_pokedex": summarize([load_ns])}
+    results.update(run_benchmarks(pokedex, seed=args.seed, scale=0.1 if args.quick else 1.0))
+
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    mismatch = baseline is not None and bool(baseline.get("quick")) != args.quick
+    print(format_table(results, None if mismatch else baseline))
+
+    report = {"seed": args.seed, "quick": args.quick, "python": platform.python_version(),
+              "machine": platform.machine(), "results": results}
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.baseline}")
+
+    if args.check:
+        if baseline is None:
+            print(f"No baseline at {args.baseline}; run with --save-baseline first.", file=sys.stderr)
+            sys.exit(2)
+        try:
+            regressions = compare(results, baseline, args.tolerance, args.quick)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            sys.exit(2)
+        for case, metric, previous, current in regressions:
+            print(f"REGRESSION {case} {metric}: {previous:.1f} -> {current:.1f}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Analysis charts: precomputed plot data and reusable figure windows.
+
+``ChartData`` does the pandas work once per frame (per-type stat means and
+the weight/base-total scatter columns as plain arrays), so redrawing a chart
+or hovering a point never touches the DataFrame. Each chart is drawn into
+the figure window with its label, cleared and reused on the next call, and the
+previous hover cursor is removed first, so repeated analysis sessions keep the
+same number of figures and callbacks alive.
+
+    data = ChartData(pokedex.df)   # once
+    plot_type_strengths(data)
+    plot_weight_vs_base_stats(data)
+
+matplotlib (and mplcursors, for hover labels) are imported on first draw.
+"""
+import numpy as np
+
+STAT_COLUMNS = ["hp", "attack", "defense", "sp_attack", "sp_defense", "speed"]
+TYPE_STRENGTHS_LABEL = "Average Base Stats by Pokémon Type"
+WEIGHT_LABEL = "Weight vs Base Total Stats"
+ANALYSIS_LABEL = "Team Type Effectiveness Analysis"
+
+# Figure label -> the mplcursors cursor currently attached to it
+_cursors = {}
+
+
+class ChartData:
+    """Aggregates and scatter arrays for one frame (the whole dex or a team)."""
+
+    def __init__(self, df):
+        self.type_means = df.groupby('type1')[STAT_COLUMNS].mean()
+        self.has_weight = 'weight_kg' in df.columns
+        if self.has_weight:
+            df = df.dropna(subset=['weight_kg'])  # Remove rows where weight_kg is NaN
+            self.weights = df['weight_kg'].to_numpy(dtype=float)
+        else:
+            self.weights = np.empty(0)
+        self.base_totals = df['base_total'].to_numpy()
+        self.names = df['name'].to_numpy(dtype=object)
+
+    def hover_text(self, index):
+        """Label for scatter point index."""
+        return (f"Name: {self.names[index]}\nWeight: {self.weights[index]} kg\n"
+                f"Base Total: {self.base_totals[index]}")
+
+
+def _figure(label, figsize):
+    """The figure window called label, cleared for redrawing (created if it is not open)."""
+    import matplotlib.pyplot as plt
+    cursor = _cursors.pop(label, None)
+    if cursor is not None:
+        cursor.remove()
+    return plt.figure(num=label, figsize=figsize, clear=True)
+
+
+def _show(fig):
+    import matplotlib.pyplot as plt
+    fig.canvas.draw_idle()
+    plt.show(block=False)
+
+
+# Bar chart of average base stats by type
+def plot_type_strengths(data, label=TYPE_STRENGTHS_LABEL):
+    """Plot average base stats per Pokémon type."""
+    fig = _figure(label, (12, 6))
+    ax = fig.add_subplot()
+    data.type_means.plot(kind='bar', ax=ax)
+    ax.set_title("Average Base Stats by Pokémon Type")
+    ax.set_xlabel("Type")
+    ax.set_ylabel("Average Stat Value")
+    ax.legend()
+    ax.tick_params(axis='x', labelrotation=45)
+    _show(fig)
+    return fig
+
+
+# Scatterplot of weight vs base total
+def plot_weight_vs_base_stats(data, label=WEIGHT_LABEL):
+    """Plot Pokémon weight vs. base stats with hover labels."""
+    if not data.has_weight:
+        raise ValueError("Column 'weight_kg' not found in dataset.")
+    import mplcursors  # Import mplcursors for interactive hover labels
+
+    fig = _figure(label, (10, 5))
+    ax = fig.add_subplot()
+    scatter = ax.scatter(data.weights, data.base_totals, alpha=0.5)
+    ax.set_title("Weight vs Base Total Stats")
+    ax.set_xlabel("Weight (kg)")
+    ax.set_ylabel("Base Total Stats")
+
+    cursor = mplcursors.cursor(scatter, hover=True)
+    cursor.connect("add", lambda sel: sel.annotation.set_text(data.hover_text(sel.index)))
+    _cursors[label] = cursor
+    _show(fig)
+    return fig
+
+
+# Text panel with a team's effectiveness report
+def plot_analysis(text, label=ANALYSIS_LABEL):
+    fig = _figure(label, (10, 6))
+    ax = fig.add_subplot()
+    ax.text(0, 1, text, fontsize=12, verticalalignment='top', family="monospace")
+    ax.axis("off")
+    ax.set_title("Team Type Effectiveness Analysis")
+    _show(fig)
+    return fig
+
+
+def close_all():
+    """Close every chart window and drop their hover cursors."""
+    import matplotlib.pyplot as plt
+    for cursor in _cursors.values():
+        cursor.remove()
+    _cursors.clear()
+    plt.close('all')
@@ -0,0 +1,175 @@
+"""Counter-team search: the best six responses to an opponent's team.
+
+An opponent team is read from a CSV in the ``save_team`` format (a ``Name``
+column, see ``library.read_team_csv``). Candidates come from the same
+generation/level/excluded-type pool as ``engine.generate_team``, and teams are scored from the precomputed
+species × species matchup table (``pokedex.matchups``)::
+
+    answer_weight * mean over opponents of the best edge any member has on it
+  + stat_weight   * (summed prioritized stat / (6 * best stat in pool))
+  - threat_weight * share of (member, opponent) pairs the opponent wins
+
+where a member's edge on an opponent is the multiplier it deals minus the
+one it takes (``hit[a, b] - hit[b, a]``). The top-k teams are found with a
+beam search that scores every extension of every kept team in one array
+operation, so a whole library of saved teams can be countered in batch::
+
+    python -m teambuilder.counter saved_team.csv --generation 1 --max-level 50 -k 3
+    python -m teambuilder.counter teams/ --generation 4 --max-level 100 -o counters.jsonl
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from teambuilder import engine
+from teambuilder.library import read_library
+
+DEFAULT_STAT = "base_total"
+DEFAULT_WEIGHTS = {"answer": 1.0, "stat": 0.5, "threat": 0.5}
+DEFAULT_BEAM_WIDTH = 48
+# Lowest possible edge (deals 0x, takes 4x); the "no answer yet" value
+EDGE_FLOOR = -4.0
+
+# Search the top-k counter teams for one opponent team
+def find_counter_teams(pokedex, opponent, generation, max_level, prioritized_stat=None, excluded_types=None,
+                       k=5, weights=None, beam_width=DEFAULT_BEAM_WIDTH, distinct_types=True):
+    """Return up to k counter teams, best first.
+
+    opponent is a list of names/records or a team DataFrame. Each result is a
+    dict with 'team' (PokemonRecords), 'score', 'answered' (opponents some
+    member has a positive edge on) and 'threatened' (members some opponent
+    out-hits). With distinct_types, members may not share a type, as in the
+    greedy selector.
+    """
+    opponent = engine.resolve_team(pokedex, opponent)
+    if not opponent:
+        raise ValueError("Opponent team is empty.")
+    stat = engine.normalize_stat(prioritized_stat) or DEFAULT_STAT
+    w = dict(DEFAULT_WEIGHTS, **(weights or {}))
+
+    pool = engine.candidate_pool(pokedex, generation, max_level, stat, excluded_types)
+    if not len(pool):
+        return []
+    opp = np.array([pokemon.position for pokemon in opponent], dtype=np.intp)
+    hit = pokedex.matchups.hit
+    # (candidates, opponents) edge and loss tables, sliced once from the matchup table
+    edge = hit[np.ix_(pool, opp)] - hit[np.ix_(opp, pool)].T
+    threat = (edge < 0).sum(axis=1) / len(opp)
+    stats = pokedex.records.column(stat)[pool].astype(float)
+    stat_share = stats / (max(stats.max(), 1.0) * engine.TEAM_SIZE)
+    type_bits = pokedex.type_bits[pool]
+
+    # Beam entries: (members tuple, best edge per opponent, stat share sum, threat sum, used type bits)
+    beam = [((), np.full(len(opp), EDGE_FLOOR), 0.0, 0.0, 0)]
+    width = max(beam_width, k)
+    for _ in range(min(engine.TEAM_SIZE, len(pool))):
+        members = [entry[0] for entry in beam]
+        best = np.maximum(np.stack([entry[1] for entry in beam])[:, None, :], edge[None, :, :])
+        stat_sum = np.array([entry[2] for entry in beam])[:, None] + stat_share[None, :]
+        threat_sum = np.array([entry[3] for entry in beam])[:, None] + threat[None, :]
+        scores = (w["answer"] * best.mean(axis=2) + w["stat"] * stat_sum
+                  - w["threat"] * threat_sum / engine.TEAM_SIZE)
+        # Rule out repeats, and shared types when distinct_types is set
+        for b, (chosen, _, _, _, used) in enumerate(beam):
+            if chosen:
+                scores[b, list(chosen)] = -np.inf
+            if distinct_types:
+                scores[b, (type_bits & used) != 0] = -np.inf
+
+        next_beam, seen = [], set()
+        for flat in np.argsort(-scores, axis=None, kind="stable"):
+            b, c = divmod(int(flat), len(pool))
+            if scores[b, c] == -np.inf or len(next_beam) >= width:
+                break
+            key = frozenset(members[b] + (c,))
+            if key in seen:
+                continue
+            seen.add(key)
+            next_beam.append((members[b] + (c,), best[b, c], stat_sum[b, c], threat_sum[b, c],
+                              beam[b][4] | int(type_bits[c])))
+        if not next_beam:
+            break
+        beam = next_beam
+
+    results = []
+    for chosen, best, stat_sum, threat_sum, _ in beam[:k]:
+        chosen = list(chosen)
+        score = w["answer"] * best.mean() + w["stat"] * stat_sum - w["threat"] * threat_sum / engine.TEAM_SIZE
+        results.append({
+            "team": pokedex.records.take(pool[chosen]),
+            "score": float(score),
+            "answered": int((best > 0).sum()),
+            "threatened": int((edge[chosen] < 0).any(axis=1).sum()),
+        })
+    return results
+
+
+# Counter one library team inside a worker
+def run_job(job):
+    """Return the result row for one (label, opponent names, options) job; errors are reported, not raised."""
+    label, names, options = job
+    row = {"opponent_file": label, "opponent": names, "counters": [], "error": ""}
+    try:
+        for result in find_counter_teams(engine.shared_pokedex(), names, **options):
+            row["counters"].append({"team": [pokemon.name for pokemon in result["team"]],
+                                    "score": round(result["score"], 4),
+                                    "answered": result["answered"], "threatened": result["threatened"]})
+    except ValueError as e:
+        row["error"] = str(e)
+    return row
+
+
+def run_library(jobs, workers=None, chunksize=4):
+    """Yield result rows for (label, names, options) jobs; workers=0 runs in-process."""
+    if workers == 0:
+        yield from map(run_job, jobs)
+        return
+    with engine.process_pool(workers) as pool:
+        yield from pool.map(run_job, jobs, chunksize=chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find the best counter teams for saved opponent teams.")
+    parser.add_argument("paths", nargs="+", help="save_team CSVs, directories of them, or batch output files")
+    parser.add_argument("--generation", type=int, required=True)
+    parser.add_argument("--max-level", type=int, required=True)
+    parser.add_argument("--stat", default=None, help="prioritized stat (default base_total)")
+    parser.add_argument("--exclude", default="", help="';'-separated excluded types")
+    parser.add_argument("-k", type=int, default=3, help="counter teams per opponent")
+    parser.add_argument("--beam-width", type=int, default=DEFAULT_BEAM_WIDTH)
+    parser.add_argument("--allow-shared-types", action="store_true", help="let members share a type")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0: in-process)")
+    parser.add_argument("-o", "--output", help="write JSONL here instead of printing a summary")
+    args = parser.parse_args(argv)
+
+    options = {"generation": args.generation, "max_level": args.max_level, "prioritized_stat": args.stat,
+               "excluded_types": engine.parse_types(args.exclude),
+               "k": args.k, "beam_width": args.beam_width, "distinct_types": not args.allow_shared_types}
+    jobs = ((label, names, options) for path in args.paths for label, names in read_library(path))
+
+    started = time.perf_counter()
+    count = 0
+    out = open(args.output, "w", encoding="utf-8") if args.output else None
+    try:
+        for row in run_library(jobs, args.workers):
+            count += 1
+            if out:
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+                continue
+            print(f"{row['opponent_file']}: {', '.join(row['opponent'])}")
+            if row["error"]:
+                print(f"  error: {row['error']}")
+            for i, counter in enumerate(row["counters"], 1):
+                print(f"  {i}. {', '.join(counter['team'])}  score={counter['score']:.3f} "
+                      f"answered={counter['answered']}/{len(row['opponent'])} threatened={counter['threatened']}")
+    finally:
+        if out:
+            out.close()
+    print(f"Countered {count} teams in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Load the bundled datasets through a cached, pre-normalized snapshot.
+
+Parsing ``evols.xlsx`` with openpyxl dominates launch time, so the three
+source files are normalized once and pickled into a single cache file next
+to them. The cache remembers each source's mtime, size and hash, and the
+pandas/numpy versions that pickled it, and rebuilds itself whenever one of
+them changes or the file cannot be unpickled. If the cache cannot be written
+(e.g. a read-only ``Data/``), the parsed snapshot is used from memory.
+
+Run ``python -m teambuilder.data`` to (re)build the cache ahead of time.
+"""
+import argparse
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "Data"
+POKEMON_CSV = DATA_DIR / "pokemon.csv"
+EVOLS_XLSX = DATA_DIR / "evols.xlsx"
+CHART_CSV = DATA_DIR / "chart.csv"
+CACHE_PATH = DATA_DIR / "pokedex.cache.pkl"
+
+# Bump whenever the normalized layout changes so old caches are rebuilt
+CACHE_VERSION = 1
+
+
+# Lowercase column names and type labels of the pokedex
+def normalize_pokemon(df):
+    """Return the pokedex with stripped/lowercased columns, names and types."""
+    df = df.copy()
+    df.columns = df.columns.str.strip().str.lower()
+    df["name"] = df["name"].str.strip()
+    for col in ("type1", "type2"):
+        df[col] = df[col].str.strip().str.lower()
+    return df
+
+
+# Keep only real evolution rows with lowercased species names
+def normalize_evolutions(evol_df):
+    """Drop the arrow/blank rows of the evolution sheet and lowercase names."""
+    evol_df = evol_df.copy()
+    evol_df.columns = evol_df.columns.str.strip().str.lower()
+    evol_df = evol_df.dropna(subset=["evolving from", "evolving to"])
+    evol_df = evol_df[["evolving from", "evolving to", "level", "condition"]].copy()
+    for col in ("evolving from", "evolving to"):
+        evol_df[col] = evol_df[col].str.strip().str.lower()
+    return evol_df.reset_index(drop=True)
+
+
+# Index the type chart by lowercase attacking type
+def normalize_type_chart(chart):
+    """Return the chart indexed by lowercase 'type' with lowercase columns."""
+    chart = chart.copy()
+    chart.columns = chart.columns.str.strip().str.lower()
+    chart["type"] = chart["type"].astype(str).str.lower().str.strip()
+    return chart.set_index("type")
+
+
+def _file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha1": _file_hash(path)}
+
+
+def _libraries():
+    # Pickled frames are only readable by compatible pandas/numpy builds
+    return {"pandas": pd.__version__, "numpy": np.__version__}
+
+
+def _sources(pokemon_path, evols_path, chart_path):
+    return {"pokemon": Path(pokemon_path), "evolutions": Path(evols_path), "chart": Path(chart_path)}
+
+
+# Where the snapshot of a set of source files lives
+def cache_path_for(pokemon_path=POKEMON_CSV, evols_path=EVOLS_XLSX, chart_path=CHART_CSV):
+    """CACHE_PATH for the bundled files; any other combination gets its own cache beside it,
+    so custom sources never overwrite the shared snapshot."""
+    paths = [path.resolve() for path in _sources(pokemon_path, evols_path, chart_path).values()]
+    if paths == [POKEMON_CSV, EVOLS_XLSX, CHART_CSV]:
+        return CACHE_PATH
+    key = hashlib.sha1("\0".join(map(str, paths)).encode("utf-8")).hexdigest()[:12]
+    return CACHE_PATH.with_name(f"pokedex.cache.{key}.pkl")
+
+
+# Parse the raw files and write the normalized snapshot
+def build_cache(cache_path=None, pokemon_path=POKEMON_CSV, evols_path=EVOLS_XLSX, chart_path=CHART_CSV):
+    """Parse the source files, normalize them and write the cache file (cache_path_for the sources by default)."""
+    sources = _sources(pokemon_path, evols_path, chart_path)
+    cache_path = cache_path or cache_path_for(*sources.values())
+    snapshot = {
+        "version": CACHE_VERSION,
+        "libraries": _libraries(),
+        "sources": {key: _fingerprint(path) for key, path in sources.items()},
+        "pokemon": normalize_pokemon(pd.read_csv(sources["pokemon"])),
+        "evolutions": normalize_evolutions(pd.read_excel(sources["evolutions"])),
+        "chart": normalize_type_chart(pd.read_csv(sources["chart"])),
+    }
+    _write(cache_path, snapshot)
+    return snapshot
+
+
+def _write(cache_path, snapshot):
+    """Store snapshot at cache_path; a failed write is logged and the caller keeps the snapshot in memory."""
+    try:
+        _replace(cache_path, snapshot)
+    except OSError as e:
+        log.warning("Could not write the data cache %s (%s); using the parsed data without caching it", cache_path, e)
+
+
+def _replace(cache_path, snapshot):
+    # Write a uniquely named file beside the target and swap it in, so a crash never
+    # leaves half a cache and concurrent writers (pool workers) never share a temp file
+    cache_path = Path(cache_path)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(snapshot, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _is_fresh(snapshot, sources):
+    """Check the cached fingerprints; a changed mtime alone falls back to the hash."""
+    if snapshot.get("version") != CACHE_VERSION or snapshot.get("libraries") != _libraries():
+        return False, False
+    touched = False
+    for key, path in sources.items():
+        cached = snapshot.get("sources", {}).get(key)
+        if cached is None or not path.exists():
+            return False, False
+        stat = os.stat(path)
+        if stat.st_mtime_ns == cached["mtime"] and stat.st_size == cached["size"]:
+            continue
+        if stat.st_size != cached["size"] or _file_hash(path) != cached["sha1"]:
+            return False, False
+        cached["mtime"] = stat.st_mtime_ns
+        touched = True
+    return True, touched
+
+
+# Load the snapshot, rebuilding it when any source file changed
+def load_snapshot(cache_path=None, pokemon_path=POKEMON_CSV, evols_path=EVOLS_XLSX, chart_path=CHART_CSV):
+    """Return the dict of normalized 'pokemon', 'evolutions' and 'chart' frames.
+
+    All three frames come from one snapshot of the given sources; cache_path
+    defaults to cache_path_for(the sources).
+    """
+    sources = _sources(pokemon_path, evols_path, chart_path)
+    cache_path = cache_path or cache_path_for(*sources.values())
+    try:
+        with open(cache_path, "rb") as fh:
+            snapshot = pickle.load(fh)
+    except Exception:  # missing, truncated or written by other library versions: rebuild
+        snapshot = None
+
+    if isinstance(snapshot, dict):
+        fresh, touched = _is_fresh(snapshot, sources)
+        if fresh:
+            # Same content with a new mtime: remember it to skip rehashing next time
+            if touched:
+                _write(cache_path, snapshot)
+            return snapshot
+
+    return build_cache(cache_path, *sources.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the cached pokedex snapshot.")
+    parser.add_argument("--cache", default=CACHE_PATH, help="cache file to write")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the cache is fresh")
+    args = parser.parse_args(argv)
+
+    snapshot = build_cache(args.cache) if args.force else load_snapshot(args.cache)
+    print(f"Cache ready at {args.cache}: {len(snapshot['pokemon'])} Pokémon, "
+          f"{len(snapshot['evolutions'])} evolutions, {len(snapshot['chart'])} types")
+
+
+if __name__ == "__main__":
+    main()
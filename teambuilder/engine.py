@@ -0,0 +1,412 @@
+"""Headless team-building engine.
+
+Everything here takes its inputs as explicit parameters, so teams can be
+generated from a worker, a service or a benchmark. Importing this module
+never touches Tk, matplotlib or PIL; the GUI in ``pkmn.py`` is a thin client.
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
+
+import numpy as np
+import pandas as pd
+
+from teambuilder import instrument
+from teambuilder.data import CHART_CSV, EVOLS_XLSX, POKEMON_CSV, load_snapshot
+from teambuilder.evolution import build_evolution_index, get_final_evolution, is_pokemon_available_by_level
+from teambuilder.lru import LRUCache
+from teambuilder.matchups import MatchupTable
+from teambuilder.names import NameIndex
+from teambuilder.records import STAT_COLUMNS, PokemonRecord, RecordStore
+from teambuilder.typechart import TypeMatrix, encode_frame, strong_weak_lists
+
+TEAM_SIZE = 6
+GENERATIONS = range(1, 9)
+CANDIDATE_CACHE_SIZE = 64
+TEAM_COLUMNS = ["Name", "Type 1", "Type 2", "HP", "Attack", "Defense", "Speed"]
+
+# The bundled pokedex of this process, see shared_pokedex
+_shared_pokedex = None
+
+log = logging.getLogger(__name__)
+
+
+class Pokedex:
+    """The loaded datasets plus the indexes built from them."""
+
+    def __init__(self, df, evol_df, type_chart):
+        # Row labels double as positions for every array index below
+        df = df.reset_index(drop=True)
+        self.df = df
+        self.evol_df = evol_df
+        self.type_chart = type_chart
+        self.evolution = build_evolution_index(evol_df)
+        # Integer type ids per row and each species' multiplier vectors, computed once
+        self.type_matrix = TypeMatrix(type_chart)
+        self.type1_ids, self.type2_ids = encode_frame(self.type_matrix, df)
+        # One bit per type id (NO_TYPE sets none), so "shares a type" is a single AND
+        self.type_bits = np.zeros(len(df), dtype=np.int64)
+        for type_ids in (self.type1_ids, self.type2_ids):
+            self.type_bits |= np.where(type_ids >= 0, np.left_shift(1, type_ids.clip(0).astype(np.int64)), 0)
+        self.offense = self.type_matrix.offense(self.type1_ids, self.type2_ids)
+        # Species × attacking-type multipliers from the against_* columns, reconciled with the chart
+        self.matchups = MatchupTable(df, self.type_matrix, self.type1_ids, self.type2_ids,
+                                     self.type_matrix.defense(self.type1_ids, self.type2_ids))
+        self.defense = self.matchups.defense
+        self.coverage = self.type_matrix.coverage(self.type1_ids, self.type2_ids)
+        # Typed columns and one shared __slots__ record per species for the engine paths
+        self.records = RecordStore(df, self.type_matrix, self.type1_ids, self.type2_ids)
+        # Resolved candidate pools by filter combination, see candidate_pool
+        self.candidates = LRUCache(maxsize=CANDIDATE_CACHE_SIZE)
+
+        # Lookup indexes so filters and name lookups never scan the frame
+        self.name_index = {}
+        for position, name in enumerate(df['name'].str.lower()):
+            self.name_index.setdefault(name, position)
+        # Prefix completion and typo-tolerant search over the same positions
+        self.name_search = NameIndex(self.records.names)
+        generations = df['generation'].to_numpy()
+        self.generation_rows = {int(g): np.flatnonzero(generations == g) for g in np.unique(generations)}
+        self.type_rows = {t: (self.type1_ids == i) | (self.type2_ids == i)
+                          for t, i in self.type_matrix.ids.items()}
+
+    def rows_for_generation(self, generation):
+        """Row positions of one generation."""
+        return self.generation_rows.get(generation, np.empty(0, dtype=np.intp))
+
+    def rows_with_types(self, types):
+        """Boolean row mask: True where either of the species' types is in types."""
+        mask = np.zeros(len(self.df), dtype=bool)
+        for t in normalize_types(types):
+            if t in self.type_rows:
+                mask |= self.type_rows[t]
+        return mask
+
+
+# Load dataframe with pkmn data from csv
+def load_pokemon_data(file_path, snapshot=None):
+    """Load and clean the Pokémon dataset (from snapshot, if one was already loaded)."""
+    snapshot = snapshot or load_snapshot(pokemon_path=file_path)
+    return snapshot["pokemon"].copy()
+
+
+# Load the type effectiveness chart
+def load_type_chart(file_path, snapshot=None):
+    """Return the chart indexed by lowercase attacking type (from snapshot, if one was already loaded)."""
+    snapshot = snapshot or load_snapshot(chart_path=file_path)
+    return snapshot["chart"].copy()
+
+
+# Load every dataset the engine needs into one Pokedex
+def load_pokedex(pokemon_path=POKEMON_CSV, evols_path=EVOLS_XLSX, chart_path=CHART_CSV):
+    """Load the pokedex, evolution sheet and type chart and build their indexes."""
+    snapshot = load_snapshot(pokemon_path=pokemon_path, evols_path=evols_path, chart_path=chart_path)
+    type_chart = load_type_chart(chart_path, snapshot)
+    df = load_pokemon_data(pokemon_path, snapshot)
+    return Pokedex(df, snapshot["evolutions"], type_chart)
+
+
+# The one pokedex a worker process (or the server) keeps warm
+def shared_pokedex():
+    """Return this process's bundled pokedex, loading it on the first call."""
+    global _shared_pokedex
+    if _shared_pokedex is None:
+        _shared_pokedex = load_pokedex()
+    return _shared_pokedex
+
+
+def _init_worker(initializer, initargs):
+    shared_pokedex()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+# Process pool for batch work; every worker loads shared_pokedex() once
+def process_pool(max_workers=None, initializer=None, initargs=()):
+    """Return a ProcessPoolExecutor whose workers have shared_pokedex() loaded.
+
+    initializer(*initargs), if given, runs in each worker after that. The
+    parent refreshes the data cache before any worker starts, so workers only
+    ever read it and never race each other rebuilding it.
+    """
+    load_snapshot()
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=_init_worker,
+                               initargs=(initializer, initargs))
+
+
+# Look up a single Pokémon by name (case-insensitive)
+def find_pokemon(pokedex, name):
+    """Return the PokemonRecord for name, or None if there is no such Pokémon."""
+    position = pokedex.name_index.get(name.strip().lower())
+    if position is None:
+        # Accent-insensitive ("flabebe" finds Flabébé)
+        position = pokedex.name_search.lookup(name)
+    if position is None:
+        return None
+    return pokedex.records[position]
+
+
+# Closest names for partial or misspelt input (autocomplete, "did you mean")
+def suggest_pokemon(pokedex, text, limit=8):
+    """Return up to limit PokemonRecords best matching text, exact and prefix matches first."""
+    return [pokedex.records[position] for position, _ in pokedex.name_search.search(text, limit)]
+
+
+# Turn a list of names/records (or a team frame) into PokemonRecords
+def resolve_team(pokedex, team):
+    """Return team as a list of PokemonRecords; unknown names raise ValueError."""
+    if team is None:
+        return []
+    if isinstance(team, pd.DataFrame):
+        name_column = 'name' if 'name' in team.columns else 'Name'
+        team = list(team[name_column])
+    members = []
+    for member in team:
+        if isinstance(member, PokemonRecord):
+            members.append(member)
+            continue
+        pokemon = find_pokemon(pokedex, str(member))
+        if pokemon is None:
+            close = suggest_pokemon(pokedex, str(member), limit=1)
+            hint = f" (did you mean {close[0].name}?)" if close else ""
+            raise ValueError(f"Unknown Pokémon: {member}{hint}")
+        members.append(pokemon)
+    return members
+
+
+# Full pokedex rows for a team, for reports and plots
+def team_frame(pokedex, team):
+    """Return the team's rows of pokedex.df as a DataFrame."""
+    return pokedex.records.to_frame(resolve_team(pokedex, team))
+
+
+def _validate_filters(generation, max_level):
+    generation = int(generation)
+    if generation not in GENERATIONS:
+        raise ValueError("Generation must be between 1 and 8.")
+    return generation, (int(max_level) if max_level is not None else None)
+
+
+def normalize_stat(prioritized_stat):
+    """Lowercase stat column name, or None for no prioritized stat; raises ValueError for any other column."""
+    if not prioritized_stat or prioritized_stat.strip().lower() == "none":
+        return None
+    stat = prioritized_stat.strip().lower()
+    if stat not in STAT_COLUMNS:
+        raise ValueError(f"Unknown stat '{prioritized_stat}'; choose one of: none, {', '.join(STAT_COLUMNS)}.")
+    return stat
+
+
+# Parse type filters given as a list or as ';'-separated text (CLI flags, CSV cells)
+def parse_types(value):
+    """Return the stripped, lowercase type names in value; None gives []."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(";")
+    return [t.strip().lower() for t in value if t.strip()]
+
+
+def normalize_types(types):
+    """Type filters as a frozenset of lowercase names; the one place filters are case-folded."""
+    return frozenset(parse_types(types))
+
+
+def bitmasks(bool_rows):
+    """Pack each row of a (n, 18) bool array into an int bitmask."""
+    bits = 1 << np.arange(bool_rows.shape[1], dtype=np.int64)
+    return [int(m) for m in (bool_rows * bits).sum(axis=1)]
+
+
+# Resolve every distinct final form obtainable under the level cap (no type filters)
+def _resolve_candidates(pokedex, generation, max_level, prioritized_stat, same_generation):
+    rows = pokedex.rows_for_generation(generation)
+    if prioritized_stat in pokedex.df.columns:
+        rows = pokedex.df[prioritized_stat].iloc[rows].sort_values(ascending=False).index.to_numpy()
+
+    # Final forms are looked up within the generation for team building and in
+    # the whole pokedex for swaps, as the original GUI did
+    names = pokedex.records.names
+    generations = pokedex.records.generation
+    positions = []
+    seen = set()
+    for row in rows:
+        name = names[row].lower()
+        final_name = get_final_evolution(pokedex.evolution, name, max_level) if max_level is not None else name
+        position = pokedex.name_index.get(final_name)
+        if position is None or position in seen:
+            continue
+        if same_generation and generations[position] != generation:
+            continue
+        seen.add(position)
+        if max_level is not None and not is_pokemon_available_by_level(pokedex.evolution, final_name, max_level):
+            continue
+        positions.append(position)
+
+    return np.array(positions, dtype=np.intp)
+
+
+# Resolve (or fetch from the LRU cache) the candidates for a set of filters
+def candidate_pool(pokedex, generation, max_level=None, prioritized_stat=None, excluded_types=None,
+                   same_generation=True):
+    """Return the row positions of the distinct candidates, best prioritized stat first.
+
+    Each species of the generation is replaced by its final form at max_level.
+    Pools are cached on pokedex.candidates keyed by (generation, max_level,
+    prioritized_stat, excluded types, same_generation); an excluded-type pool
+    is derived from the cached unfiltered pool with a single type mask.
+    The returned array is shared with the cache and must not be modified.
+    """
+    generation, max_level = _validate_filters(generation, max_level)
+    prioritized_stat = normalize_stat(prioritized_stat)
+    excluded_types = normalize_types(excluded_types)
+
+    def base():
+        return pokedex.candidates.get(
+            (generation, max_level, prioritized_stat, frozenset(), same_generation),
+            lambda: _resolve_candidates(pokedex, generation, max_level, prioritized_stat, same_generation))
+
+    if not excluded_types:
+        return base()
+
+    def masked():
+        pool = base()
+        return pool[~pokedex.rows_with_types(excluded_types)[pool]]
+
+    return pokedex.candidates.get((generation, max_level, prioritized_stat, excluded_types, same_generation), masked)
+
+
+# Select a team of Pokémon from a resolved candidate pool
+def select_custom_team(pokedex, pool, preferred_types=None, locked_team=None):
+    """Greedily fill the team in pool order, avoiding repeated types.
+
+    A candidate is taken when it shares no type with the team so far or has
+    one of the preferred types. Members of locked_team are kept first and
+    count towards the six slots and the types already in use.
+    """
+    team = list(locked_team or [])
+    used_types = set()
+    locked = set()
+    for pokemon in team:
+        used_types.update(pokemon.types())
+        locked.add(pokemon.position)
+
+    preferred = pokedex.rows_with_types(preferred_types or [])[pool]
+    records = pokedex.records
+    for position, is_preferred in zip(pool.tolist(), preferred.tolist()):
+        if len(team) >= TEAM_SIZE:
+            break
+        if position in locked:
+            continue
+        pokemon = records[position]
+        pokemon_types = pokemon.types()
+        if is_preferred or used_types.isdisjoint(pokemon_types):
+            team.append(pokemon)
+            used_types.update(pokemon_types)
+
+    return team
+
+
+# Generate team that meets preferred options
+def generate_team(pokedex, generation, max_level, prioritized_stat=None, preferred_types=None,
+                  excluded_types=None, locked_team=None):
+    """Build a team (list of PokemonRecords) for the filters; raises ValueError for invalid filters.
+
+    locked_team may be a list of names/records or a team DataFrame whose members must stay.
+    """
+    locked_team = resolve_team(pokedex, locked_team)
+    pool = candidate_pool(pokedex, generation, max_level, prioritized_stat, excluded_types)
+    return select_custom_team(pokedex, pool, list(preferred_types or []), locked_team)
+
+
+# Find an alternative for one team slot that meets or is close to criteria
+def find_swap_candidate(pokedex, team, slot, generation, max_level, prioritized_stat=None, excluded_types=None):
+    """Return the best replacement record for team slot, or None if nothing fits."""
+    team = resolve_team(pokedex, team)
+    if not 0 <= slot < len(team):
+        raise IndexError(f"Team has no slot {slot}")
+    pool = candidate_pool(pokedex, generation, max_level, prioritized_stat, excluded_types, same_generation=False)
+
+    type_counts = {}
+    for pokemon in team:
+        for t in pokemon.types():
+            type_counts[t] = type_counts.get(t, 0) + 1
+
+    # Skip current members and anything adding a third copy of a type
+    blocked = pokedex.rows_with_types([t for t, count in type_counts.items() if count >= 2])
+    blocked[[pokemon.position for pokemon in team]] = True
+    allowed = np.flatnonzero(~blocked[pool])
+    if not len(allowed):
+        return None
+    return pokedex.records[pool[allowed[0]]]
+
+
+# Swap one team member for the best alternative under the filters
+def swap_pokemon(pokedex, team, slot, generation, max_level, prioritized_stat=None, excluded_types=None):
+    """Return a new team with slot replaced, or None when no swap is available."""
+    team = resolve_team(pokedex, team)
+    replacement = find_swap_candidate(pokedex, team, slot, generation, max_level, prioritized_stat, excluded_types)
+    if replacement is None:
+        return None
+    team = list(team)
+    team[slot] = replacement
+    return team
+
+
+# Generate type matchup details for each team member
+def generate_team_recommendations(team, type_matrix):
+    """Analyze Pokémon team and display their type effectiveness."""
+    report = "**Team Type Effectiveness Analysis**\n\n"
+
+    type1_ids = np.array([pokemon.type1_id for pokemon in team], dtype=np.int8)
+    type2_ids = np.array([pokemon.type2_id for pokemon in team], dtype=np.int8)
+    matchups = strong_weak_lists(type_matrix, type1_ids, type2_ids)
+
+    for pokemon, (strong_against, weak_against) in zip(team, matchups):
+        p_name = pokemon.name
+        type1 = pokemon.type1
+        type2 = pokemon.type2
+
+        log.debug("Analyzing Pokémon: %s, Type: %s/%s", p_name, type1, type2 or "")
+
+        report += f"🔹 **{p_name} ({type1}{'/' + type2 if type2 else ''})**\n"
+        report += f"   - **Strong Against:** {', '.join(strong_against) if strong_against else 'None'}\n"
+        report += f"   - **Weak Against:** {', '.join(weak_against) if weak_against else 'None'}\n\n"
+
+    log.debug("%s", report)
+    return report
+
+
+# Analyze the selected team and summarize stats and effectiveness
+def analyze_team(team, type_matrix):
+    """Return the full text analysis for a team of records; raises ValueError for an empty team."""
+    if not team:
+        raise ValueError("Team is empty.")
+
+    strongest_pokemon = max(team, key=attrgetter('attack'))
+    weakest_pokemon = min(team, key=attrgetter('defense'))
+
+    team_analysis = "**Team Analysis & Stats**\n\n"
+    team_analysis += f"**Strongest Pokémon:** {strongest_pokemon.name} (Attack: {strongest_pokemon.attack})\n"
+    team_analysis += f"**Weakest Pokémon:** {weakest_pokemon.name} (Defense: {weakest_pokemon.defense})\n\n"
+
+    # Generate type effectiveness details
+    team_analysis += generate_team_recommendations(team, type_matrix)
+    return team_analysis
+
+
+# Flatten a team member into the row shown in the GUI table and written by save_team
+def team_row(pokemon):
+    """Return the (name, type1, type2, hp, attack, defense, speed) tuple for one member."""
+    return (pokemon.name, pokemon.type1, pokemon.type2 or "",
+            pokemon.hp, pokemon.attack, pokemon.defense, pokemon.speed)
+
+
+def team_rows(team):
+    """Return team_row tuples for every member of a team."""
+    return [team_row(pokemon) for pokemon in team]
+
+
+# TEAMBUILDER_PROFILE turns on the hot-path timers once the functions above exist
+instrument._enable_from_environment()
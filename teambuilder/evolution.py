@@ -0,0 +1,50 @@
+"""Evolution graph built once from the evolution sheet.
+
+The index maps each species to its ``(level, child)`` evolutions in sheet
+order and to the level at which it first becomes obtainable, so both
+"final form at level L" and "obtainable at level L" walk only the chain.
+"""
+import pandas as pd
+
+
+# Build the evolution graph once so level lookups never rescan the sheet
+def build_evolution_index(evol_df):
+    """Map each species to its (level, child) evolutions and the level it becomes obtainable."""
+    children = {}
+    obtain_level = {}
+    names = set()
+    for src, dst, level in zip(evol_df['evolving from'], evol_df['evolving to'], evol_df['level']):
+        if pd.isna(src) or pd.isna(dst) or pd.isna(level):
+            continue
+        src, dst = src.lower(), dst.lower()
+        # Keep sheet order so the first matching evolution wins
+        children.setdefault(src, []).append((level, dst))
+        # A species is only obtainable once every evolution into it is reachable
+        obtain_level[dst] = max(obtain_level.get(dst, level), level)
+        if level <= 100:
+            names.add(src)
+            names.add(dst)
+    return {"children": children, "obtain_level": obtain_level, "names": names}
+
+
+# Follow the evolution chain as far as the level cap allows
+def get_final_evolution(evolution_index, name, max_level):
+    """Return the lowercase name of the furthest form reachable by max_level."""
+    current = name.lower()
+    seen = {current}
+    while True:
+        for level, child in evolution_index["children"].get(current, ()):
+            if level <= max_level:
+                break
+        else:
+            return current
+        if child in seen:
+            return current
+        seen.add(child)
+        current = child
+
+
+# Check if a Pokémon is valid under a given level
+def is_pokemon_available_by_level(evolution_index, name, max_level):
+    """Return True when no evolution into this species needs more than max_level."""
+    return evolution_index["obtain_level"].get(name.lower(), 0) <= max_level
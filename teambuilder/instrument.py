@@ -0,0 +1,161 @@
+"""Opt-in call counters and latency histograms for the engine hot paths.
+
+Nothing is measured until ``enable()`` is called. Enabling swaps each hot
+function for a timing wrapper in every loaded ``teambuilder`` module that
+references it (callers outside the package should go through the module,
+e.g. ``engine.swap_pokemon``), so the disabled path costs nothing; ``disable()``
+puts the originals back. Timings go into power-of-two nanosecond buckets,
+so memory stays fixed however many calls are made.
+
+    from teambuilder import instrument
+    instrument.enable()
+    ...  # generate, swap, batch runs
+    instrument.dump("timings.json")
+
+Setting ``TEAMBUILDER_PROFILE=timings.json`` enables it at import and
+dumps when the process exits (``{pid}`` in the path is replaced by the
+process id, for worker pools).
+"""
+import atexit
+import functools
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+# (module, function) pairs wrapped by enable()
+HOT_FUNCTIONS = (
+    ("teambuilder.engine", "select_custom_team"),
+    ("teambuilder.engine", "swap_pokemon"),
+    ("teambuilder.evolution", "get_final_evolution"),
+    ("teambuilder.evolution", "is_pokemon_available_by_level"),
+)
+BUCKETS = 48
+
+_lock = threading.Lock()
+_counters = {}
+# original function -> wrapper, while enabled
+_wrapped = {}
+
+
+class _Counter:
+    __slots__ = ("calls", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = [0] * BUCKETS
+
+    def add(self, elapsed):
+        self.calls += 1
+        self.total_ns += elapsed
+        self.min_ns = elapsed if self.min_ns is None else min(self.min_ns, elapsed)
+        self.max_ns = max(self.max_ns, elapsed)
+        self.buckets[min(elapsed.bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, q):
+        """Upper edge (ns) of the bucket holding the q-th percentile call."""
+        target = q / 100 * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(1 << i, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.calls / 1e3 if self.calls else 0.0,
+            "min_us": (self.min_ns or 0) / 1e3,
+            "p50_us": self.percentile(50) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+            "histogram_ns": {f"<{1 << i}": count for i, count in enumerate(self.buckets) if count},
+        }
+
+
+def _wrap(name, fn):
+    counter = _counters.setdefault(name, _Counter())
+    timer = time.perf_counter_ns
+
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        started = timer()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = timer() - started
+            with _lock:
+                counter.add(elapsed)
+
+    timed.__wrapped_original__ = fn
+    return timed
+
+
+def _rebind(mapping):
+    """Point every loaded teambuilder module at mapping[fn] wherever it holds fn."""
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not module_name.startswith("teambuilder"):
+            continue
+        for attr, value in list(vars(module).items()):
+            replacement = mapping.get(id(value))
+            if replacement is not None and value is replacement[0]:
+                setattr(module, attr, replacement[1])
+
+
+def enable():
+    """Start counting calls to HOT_FUNCTIONS; safe to call more than once."""
+    if _wrapped:
+        return
+    mapping = {}
+    for module_name, attr in HOT_FUNCTIONS:
+        fn = getattr(importlib.import_module(module_name), attr)
+        wrapper = _wrap(f"{module_name.rsplit('.', 1)[-1]}.{attr}", fn)
+        _wrapped[fn] = wrapper
+        mapping[id(fn)] = (fn, wrapper)
+    _rebind(mapping)
+
+
+def disable():
+    """Restore the original functions; collected counters are kept."""
+    _rebind({id(wrapper): (wrapper, fn) for fn, wrapper in _wrapped.items()})
+    _wrapped.clear()
+
+
+def enabled():
+    return bool(_wrapped)
+
+
+def reset():
+    """Zero every counter (wrappers keep their counter objects)."""
+    with _lock:
+        for counter in _counters.values():
+            counter.__init__()
+
+
+def snapshot():
+    """Per-function counters as a JSON-ready dict."""
+    with _lock:
+        return {name: counter.to_dict() for name, counter in sorted(_counters.items())}
+
+
+def dump(path):
+    """Write snapshot() to path as JSON."""
+    path = str(path).replace("{pid}", str(os.getpid()))
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"pid": os.getpid(), "functions": snapshot()}, fh, indent=2)
+        fh.write("\n")
+    return path
+
+
+def _enable_from_environment():
+    path = os.environ.get("TEAMBUILDER_PROFILE")
+    if path:
+        enable()
+        atexit.register(dump, path)
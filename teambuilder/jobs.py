@@ -0,0 +1,148 @@
+"""Background jobs for the GUI, at most one in flight per action.
+
+Tk is single-threaded, so long engine calls run on a small thread pool while
+the main loop keeps drawing. The GUI polls ``JobRunner.poll`` from
+``root.after``; finished jobs have their callbacks run right there, on the Tk
+thread, so callbacks may touch widgets freely.
+
+Cancelling a job drops its result. A job that has not started yet never
+runs; one already running finishes in the background and is ignored, and
+its action stays busy until it does, so a cancelled search can never hold a
+worker while a fresh copy of it takes the other.
+
+A callback that raises is logged and does not stop later deliveries.
+
+The workers are daemon threads. ``shutdown`` cancels every queued job and
+returns at once. A job still running when the window closes is abandoned
+and ends with the process. Jobs only compute results, so nothing is lost.
+(``ThreadPoolExecutor`` joins its threads at exit, which kept the process
+alive until a long search finished.)
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+log = logging.getLogger(__name__)
+
+
+class _DaemonPool:
+    """A minimal executor whose worker threads never keep the process alive."""
+
+    def __init__(self, max_workers, thread_name_prefix):
+        self._queue = queue.SimpleQueue()
+        self._threads = [threading.Thread(target=self._work, name=f"{thread_name_prefix}_{i}", daemon=True)
+                         for i in range(max_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn, *args):
+        future = Future()
+        self._queue.put((future, fn, args))
+        return future
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    # Cancel what is queued and let the workers exit once their current job is done
+    def shutdown(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _ in self._threads:
+            self._queue.put(None)
+
+
+class JobRunner:
+    """Runs engine calls off the Tk thread and hands results back through poll()."""
+
+    def __init__(self, max_workers=2):
+        self._pool = _DaemonPool(max_workers, thread_name_prefix="teambuilder-job")
+        # action -> (future, on_done, on_error, started)
+        self._jobs = {}
+        # action -> future of a cancelled job that is still running
+        self._cancelled = {}
+
+    def running(self, action=None):
+        """True if the given action (or any action) has a job in flight."""
+        return action in self._jobs if action is not None else bool(self._jobs)
+
+    def active(self):
+        """Names of the actions with a job in flight, oldest first."""
+        return list(self._jobs)
+
+    def elapsed(self, action):
+        """Seconds since the action's job was submitted, or None."""
+        job = self._jobs.get(action)
+        return time.perf_counter() - job[3] if job else None
+
+    def cancelling(self, action):
+        """True while a cancelled job of the action is still running."""
+        future = self._cancelled.get(action)
+        if future is not None and future.done():
+            del self._cancelled[action]
+            return False
+        return future is not None
+
+    # Queue fn(*args) for an action unless that action is already busy
+    def submit(self, action, fn, *args, on_done, on_error=None):
+        """Return True if the job was queued, False if the action has one in flight or still winding down."""
+        if action in self._jobs or self.cancelling(action):
+            return False
+        future = self._pool.submit(fn, *args)
+        self._jobs[action] = (future, on_done, on_error, time.perf_counter())
+        return True
+
+    def cancel(self, action=None):
+        """Forget the action's job (or every job); returns the cancelled action names."""
+        actions = [action] if action is not None else list(self._jobs)
+        cancelled = []
+        for name in actions:
+            job = self._jobs.pop(name, None)
+            if job is not None:
+                if not job[0].cancel():
+                    self._cancelled[name] = job[0]
+                cancelled.append(name)
+        return cancelled
+
+    # Called from the Tk thread: deliver every finished job to its callback
+    def poll(self):
+        """Run the callbacks of finished jobs; returns how many were delivered."""
+        for name in list(self._cancelled):
+            self.cancelling(name)
+        finished = [name for name, job in self._jobs.items() if job[0].done()]
+        for name in finished:
+            future, on_done, on_error, _ = self._jobs.pop(name)
+            error = future.exception()
+            try:
+                if error is None:
+                    on_done(future.result())
+                elif on_error is not None:
+                    on_error(error)
+                else:
+                    log.error("%s job failed", name, exc_info=error)
+            except Exception:
+                log.exception("Callback for the %s job failed", name)
+        return len(finished)
+
+    def shutdown(self):
+        """Cancel every job and stop the workers without waiting; a running job is abandoned at exit."""
+        self.cancel()
+        self._pool.shutdown()
@@ -0,0 +1,309 @@
+"""Streaming analysis of saved-team libraries.
+
+Teams are read one at a time from ``save_team`` CSVs, directories of them,
+or ``teambuilder.batch`` output (CSV/JSONL), and analyzed in fixed-size
+chunks with the rules of the per-member report that
+``engine.generate_team_recommendations`` prints: a member is strong against
+a defending type when the product of its types' attacking rows is above 1
+and weak against it when the product is below 1. Every count below is made
+from those "Strong Against" / "Weak Against" lists. They differ from
+``typechart.score_teams`` (either-type coverage, defensive weaknesses), so
+the per-team fields are named ``strong_coverage``, ``shared_weak_against``
+and ``worst_weak_against`` rather than reusing its keys.
+
+Only fixed-size aggregates are kept, sized by the number of species and
+types, never by the number of teams:
+
+* weakness histograms: for each defending type, how many teams have
+  0..6 members weak against it; plus shared/worst weakness histograms
+* most common members, and the most common strongest/weakest members
+* coverage gaps: how often no member is strong against each defending type,
+  and a histogram of strong-coverage counts
+* per-stat team total min/mean/max
+
+::
+
+    python -m teambuilder.library teams.jsonl saved/ -o summary.json --per-team rows.jsonl
+
+The summary file is rewritten every ``--flush-every`` teams, so it is
+usable while a long run is still going.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from teambuilder import engine
+from teambuilder.records import STAT_COLUMNS
+from teambuilder.typechart import NO_TYPE
+
+DEFAULT_CHUNK = 2048
+DEFAULT_FLUSH_EVERY = 5000
+MAX_ERROR_EXAMPLES = 20
+
+
+# Read a team written by save_team
+def read_team_csv(path):
+    """Return the Pokémon names in a save_team CSV (the 'Name' column)."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.DictReader(fh)
+        column = "Name" if "Name" in (reader.fieldnames or []) else "name"
+        return [row[column].strip() for row in reader if row.get(column, "").strip()]
+
+
+# Enumerate the teams in a library path, one at a time
+def read_library(path):
+    """Yield (label, names) for every team under path.
+
+    path may be a save_team CSV, a directory of them, or a teambuilder.batch
+    output (.csv or .jsonl with a 'team' column of ';'-joined or listed names).
+    """
+    path = Path(path)
+    if path.is_dir():
+        for child in sorted(path.glob("*.csv")):
+            yield str(child), read_team_csv(child)
+        return
+    if path.suffix == ".jsonl":
+        with open(path, encoding="utf-8") as fh:
+            for i, line in enumerate(fh):
+                if line.strip():
+                    team = json.loads(line)["team"]
+                    yield f"{path}:{i + 1}", team.split(";") if isinstance(team, str) else team
+        return
+    with open(path, newline="", encoding="utf-8") as fh:
+        fieldnames = csv.DictReader(fh).fieldnames or []
+    if "team" in fieldnames:
+        with open(path, newline="", encoding="utf-8") as fh:
+            for i, row in enumerate(csv.DictReader(fh)):
+                if row["team"]:
+                    yield f"{path}:{i + 2}", row["team"].split(";")
+    else:
+        yield str(path), read_team_csv(path)
+
+
+class LibraryStats:
+    """Running aggregates over every team fed to add_chunk."""
+
+    def __init__(self, pokedex):
+        self._pokedex = pokedex
+        size = len(pokedex.type_matrix)
+        self.teams = 0
+        self.members = 0
+        self.errors = 0
+        self.error_examples = []
+        self.weakness_hist = np.zeros((size, engine.TEAM_SIZE + 1), dtype=np.int64)
+        self.shared_weakness_hist = np.zeros(size + 1, dtype=np.int64)
+        self.worst_weakness_hist = np.zeros(engine.TEAM_SIZE + 1, dtype=np.int64)
+        self.coverage_hist = np.zeros(size + 1, dtype=np.int64)
+        self.gap_counts = np.zeros(size, dtype=np.int64)
+        self.member_counts = np.zeros(len(pokedex.records), dtype=np.int64)
+        self.strongest_counts = np.zeros(len(pokedex.records), dtype=np.int64)
+        self.weakest_counts = np.zeros(len(pokedex.records), dtype=np.int64)
+        self.stat_sum = dict.fromkeys(STAT_COLUMNS, 0)
+        self.stat_min = dict.fromkeys(STAT_COLUMNS, None)
+        self.stat_max = dict.fromkeys(STAT_COLUMNS, None)
+
+    def resolve(self, label, names):
+        """Row positions for one team's names, or None (counted as an error)."""
+        positions = [self._pokedex.name_index.get(str(name).strip().lower()) for name in names]
+        problem = None
+        if not positions:
+            problem = "empty team"
+        elif len(positions) > engine.TEAM_SIZE:
+            problem = f"{len(positions)} members"
+        elif None in positions:
+            problem = "unknown Pokémon: " + ", ".join(str(n) for n, p in zip(names, positions) if p is None)
+        if problem is None:
+            return positions
+        self.errors += 1
+        if len(self.error_examples) < MAX_ERROR_EXAMPLES:
+            self.error_examples.append(f"{label}: {problem}")
+        return None
+
+    # Analyze a chunk of resolved teams with one set of array ops
+    def add_chunk(self, teams):
+        """Fold a list of position lists into the aggregates; returns per-team result dicts."""
+        if not teams:
+            return []
+        pokedex = self._pokedex
+        type_matrix = pokedex.type_matrix
+        positions = np.full((len(teams), engine.TEAM_SIZE), -1, dtype=np.intp)
+        for i, team in enumerate(teams):
+            positions[i, :len(team)] = team
+        present = positions >= 0
+        safe = np.where(present, positions, 0)
+        # Empty slots get NO_TYPE, which is neutral in every lookup below
+        type1 = np.where(present, pokedex.type1_ids[safe], NO_TYPE)
+        type2 = np.where(present, pokedex.type2_ids[safe], NO_TYPE)
+
+        # (teams, members, defending types) multipliers, as in the report's strong/weak lists
+        offense = type_matrix.offense(type1, type2)
+        strong = (offense > 1).any(axis=1)
+        weak = (offense < 1).sum(axis=1)
+        covered = strong.sum(axis=1)
+
+        rows = np.arange(len(teams))
+        for i in range(weak.shape[1]):
+            self.weakness_hist[i] += np.bincount(weak[:, i], minlength=engine.TEAM_SIZE + 1)
+        shared = (weak >= 2).sum(axis=1)
+        worst = weak.max(axis=1)
+        self.shared_weakness_hist += np.bincount(shared, minlength=len(self.shared_weakness_hist))
+        self.worst_weakness_hist += np.bincount(worst, minlength=len(self.worst_weakness_hist))
+        self.coverage_hist += np.bincount(covered, minlength=len(self.coverage_hist))
+        self.gap_counts += (~strong).sum(axis=0)
+        self.member_counts += np.bincount(positions[present], minlength=len(self.member_counts))
+
+        # Strongest = highest attack, weakest = lowest defense, first slot on ties (as analyze_team)
+        attack = np.where(present, pokedex.records.column("attack")[safe], -1)
+        defense = np.where(present, pokedex.records.column("defense")[safe], np.iinfo(np.int16).max)
+        strongest = positions[rows, attack.argmax(axis=1)]
+        weakest = positions[rows, defense.argmin(axis=1)]
+        np.add.at(self.strongest_counts, strongest, 1)
+        np.add.at(self.weakest_counts, weakest, 1)
+
+        totals = {}
+        for column in STAT_COLUMNS:
+            total = np.where(present, pokedex.records.column(column)[safe], 0).sum(axis=1)
+            totals[column] = total
+            self.stat_sum[column] += int(total.sum())
+            low, high = int(total.min()), int(total.max())
+            self.stat_min[column] = low if self.stat_min[column] is None else min(self.stat_min[column], low)
+            self.stat_max[column] = high if self.stat_max[column] is None else max(self.stat_max[column], high)
+
+        self.teams += len(teams)
+        self.members += int(present.sum())
+
+        types = type_matrix.types
+        names = pokedex.records.names
+        return [{
+            "strong_coverage": int(covered[i]),
+            "gaps": [types[t] for t in np.flatnonzero(~strong[i])],
+            "shared_weak_against": int(shared[i]),
+            "worst_weak_against": int(worst[i]),
+            "strongest": names[strongest[i]],
+            "weakest": names[weakest[i]],
+            "base_total": int(totals["base_total"][i]),
+        } for i in range(len(teams))]
+
+    def summary(self, top=20):
+        """The aggregates as a JSON-ready dict."""
+        types = self._pokedex.type_matrix.types
+        names = self._pokedex.records.names
+
+        def most_common(counts):
+            order = np.argsort(-counts, kind="stable")[:top]
+            return [[names[i], int(counts[i])] for i in order if counts[i]]
+
+        teams = max(self.teams, 1)
+        return {
+            "teams": self.teams,
+            "members": self.members,
+            "errors": self.errors,
+            "error_examples": self.error_examples,
+            "weakness_histogram": {t: self.weakness_hist[i].tolist() for i, t in enumerate(types)},
+            "shared_weakness_histogram": self.shared_weakness_hist.tolist(),
+            "worst_weakness_histogram": self.worst_weakness_hist.tolist(),
+            "coverage_histogram": self.coverage_hist.tolist(),
+            "coverage_gaps": {t: int(self.gap_counts[i]) for i, t in enumerate(types)},
+            "most_common_members": most_common(self.member_counts),
+            "most_common_strongest": most_common(self.strongest_counts),
+            "most_common_weakest": most_common(self.weakest_counts),
+            "stat_totals": {column: {"min": self.stat_min[column], "max": self.stat_max[column],
+                                     "mean": self.stat_sum[column] / teams} for column in STAT_COLUMNS},
+        }
+
+
+def _write_json(path, payload):
+    # Write beside the target and swap in, so readers never see half a file
+    tmp_path = Path(f"{path}.tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+# Stream every team through LibraryStats chunk by chunk
+def analyze_library(pokedex, teams, chunk=DEFAULT_CHUNK, on_team=None, on_flush=None, flush_every=DEFAULT_FLUSH_EVERY):
+    """Analyze an iterable of (label, names) and return the LibraryStats.
+
+    on_team(label, result) is called for every valid team and on_flush(stats)
+    about every flush_every teams; memory stays bounded by chunk.
+    """
+    stats = LibraryStats(pokedex)
+    teams = iter(teams)
+    next_flush = flush_every
+    while True:
+        batch = list(islice(teams, chunk))
+        if not batch:
+            break
+        labels, resolved = [], []
+        for label, names in batch:
+            positions = stats.resolve(label, names)
+            if positions is not None:
+                labels.append(label)
+                resolved.append(positions)
+        results = stats.add_chunk(resolved)
+        if on_team is not None:
+            for label, result in zip(labels, results):
+                on_team(label, result)
+        if on_flush is not None and stats.teams >= next_flush:
+            on_flush(stats)
+            next_flush = stats.teams + flush_every
+    return stats
+
+
+def format_summary(summary, top=10):
+    lines = [f"{summary['teams']} teams, {summary['members']} members, {summary['errors']} skipped"]
+    gaps = sorted(summary["coverage_gaps"].items(), key=lambda item: -item[1])
+    lines.append("Most common coverage gaps: " + ", ".join(f"{t} ({n})" for t, n in gaps[:5]))
+    weak = sorted(summary["weakness_histogram"].items(), key=lambda item: -sum(item[1][2:]))
+    lines.append("Most shared weaknesses (teams with 2+ members weak against it): "
+                 + ", ".join(f"{t} ({sum(h[2:])})" for t, h in weak[:5]))
+    lines.append("Most common members: " + ", ".join(f"{n} ({c})" for n, c in summary["most_common_members"][:top]))
+    for example in summary["error_examples"][:5]:
+        lines.append(f"  skipped {example}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a library of saved teams in constant memory.")
+    parser.add_argument("paths", nargs="+", help="save_team CSVs, directories of them, or batch output files")
+    parser.add_argument("-o", "--output", help="summary JSON, rewritten as the run progresses")
+    parser.add_argument("--per-team", help="also stream one JSONL result row per team here")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="teams analyzed per array batch")
+    parser.add_argument("--flush-every", type=int, default=DEFAULT_FLUSH_EVERY)
+    parser.add_argument("--top", type=int, default=20, help="entries in the most-common lists")
+    args = parser.parse_args(argv)
+
+    pokedex = engine.load_pokedex()
+    teams = ((label, names) for path in args.paths for label, names in read_library(path))
+
+    started = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        per_team = stack.enter_context(open(args.per_team, "w", encoding="utf-8")) if args.per_team else None
+
+        def on_team(label, result):
+            per_team.write(json.dumps(dict(source=label, **result), ensure_ascii=False) + "\n")
+
+        def on_flush(stats):
+            if per_team:
+                per_team.flush()
+            if args.output:
+                _write_json(args.output, stats.summary(args.top))
+
+        stats = analyze_library(pokedex, teams, args.chunk, on_team if per_team else None, on_flush,
+                                args.flush_every)
+    summary = stats.summary(args.top)
+    if args.output:
+        _write_json(args.output, summary)
+    print(format_summary(summary))
+    print(f"Analyzed {stats.teams} teams in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
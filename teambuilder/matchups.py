@@ -0,0 +1,95 @@
+"""Species-level matchup tables built once at load time.
+
+``pokemon.csv`` ships 18 ``against_*`` columns: the damage multiplier each
+species takes from every attacking type. They are read into a species ×
+attacking-type matrix and reconciled against the multipliers derived from
+``chart.csv`` and each species' listed types. Where the two disagree (the
+dataset lists regional forms' types but the base form's multipliers), the
+chart value wins, so the matrix always agrees with the types the engine
+filters on, and the mismatch is recorded in ``MatchupTable.mismatches``.
+The resulting ``defense`` matrix therefore equals the chart-derived one; the
+against_* columns serve as a cross-check of the data, not a second source.
+
+From that matrix the table also holds the species × species ``hit[a, b]``:
+the best multiplier either of a's own types deals to b. Team weaknesses
+(``Pokedex.defense``, used by ``TeamState``) are row slices of ``defense``;
+counter search and the battle simulator slice ``hit``.
+
+Run ``python -m teambuilder.matchups`` to list the flagged mismatches.
+"""
+import argparse
+
+import numpy as np
+
+from teambuilder.typechart import NO_TYPE
+
+# pokemon.csv abbreviates some type names in its against_* columns
+AGAINST_ALIASES = {"fighting": "fight"}
+
+
+def against_columns(types):
+    """The against_* column name for each type, in the given order."""
+    return [f"against_{AGAINST_ALIASES.get(t, t)}" for t in types]
+
+
+# Reconcile the dataset's multipliers with the chart-derived ones
+def reconcile(against, chart_defense, names, types, atol=1e-9):
+    """Return (matrix, mismatches); the matrix takes the chart value wherever the two differ.
+
+    mismatches is a list of {'name', 'type', 'against', 'chart'} dicts, one per
+    disagreeing cell. Missing against_* values are filled from the chart silently.
+    """
+    matrix = np.where(np.isnan(against), chart_defense, against)
+    differs = ~np.isclose(matrix, chart_defense, rtol=0, atol=atol)
+    mismatches = [{"name": names[row], "type": types[col],
+                   "against": float(matrix[row, col]), "chart": float(chart_defense[row, col])}
+                  for row, col in np.argwhere(differs)]
+    matrix[differs] = chart_defense[differs]
+    return matrix, mismatches
+
+
+class MatchupTable:
+    """Species × attacking-type multipliers and the species × species best-hit table."""
+
+    def __init__(self, df, type_matrix, type1_ids, type2_ids, chart_defense):
+        types = type_matrix.types
+        names = list(df['name'])
+        columns = against_columns(types)
+        if all(column in df.columns for column in columns):
+            against = df[columns].to_numpy(dtype=float)
+        else:
+            against = np.full_like(chart_defense, np.nan)
+        self.defense, self.mismatches = reconcile(against, chart_defense, names, types)
+
+        # Best own-type multiplier attacker a deals to defender b, from b's defense row;
+        # NO_TYPE (-1) must not index the last column: a missing type falls back to the
+        # other one, and a species with no known type hits everything neutrally
+        own1 = np.where(type1_ids == NO_TYPE, type2_ids, type1_ids)
+        own2 = np.where(type2_ids == NO_TYPE, own1, type2_ids)
+        hit = np.maximum(self.defense[:, own1.clip(0)], self.defense[:, own2.clip(0)])
+        hit[:, own1 == NO_TYPE] = 1.0
+        self.hit = np.ascontiguousarray(hit.T, dtype=np.float32)
+
+    def mismatched_species(self):
+        """Names of the species whose against_* columns disagree with the chart."""
+        return sorted({m["name"] for m in self.mismatches})
+
+
+def main(argv=None):
+    from teambuilder import engine
+
+    parser = argparse.ArgumentParser(description="Report against_* columns that disagree with chart.csv.")
+    parser.add_argument("--cells", action="store_true", help="list every mismatching cell, not just species")
+    args = parser.parse_args(argv)
+
+    pokedex = engine.load_pokedex()
+    table = pokedex.matchups
+    if args.cells:
+        for m in table.mismatches:
+            print(f"{m['name']:<14} {m['type']:<9} against={m['against']:<5g} chart={m['chart']:g}")
+    species = table.mismatched_species()
+    print(f"{len(table.mismatches)} mismatching cells across {len(species)} species: {', '.join(species)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Prefix and typo-tolerant lookups over the species names.
+
+Built once at load (``Pokedex.name_search``). Names are folded to lowercase
+ASCII ("Flabébé" -> "flabebe") and indexed two ways:
+
+* a sorted list of every name and every word start inside a name
+  ("mr. mime" is also found under "mime"), so a prefix query is a bisect
+  plus a short scan
+* a trigram index (name -> padded 3-letter chunks), so a misspelt query
+  only scores the names sharing a trigram with it; the best of those are
+  re-ranked by edit distance
+
+With ~800 species either query answers in a few microseconds, fast enough
+to run on every keystroke.
+"""
+import heapq
+import unicodedata
+from bisect import bisect_left
+
+DEFAULT_LIMIT = 8
+# Only this many trigram candidates are re-ranked by edit distance
+RERANK = 10
+# Shorter queries are answered by prefix matches only
+MIN_FUZZY_LENGTH = 3
+
+
+def fold(text):
+    """Lowercase, strip accents and surrounding space."""
+    text = unicodedata.normalize("NFKD", str(text).strip().lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def _trigrams(text, end=" "):
+    padded = f"  {text}{end}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 once it is certain to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        best = left = i
+        for j, cb in enumerate(b, 1):
+            cost = previous[j - 1] + (ca != cb)
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if left + 1 < cost:
+                cost = left + 1
+            current.append(cost)
+            left = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    """Prefix completion and fuzzy search over a list of display names."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.folded = [fold(name) for name in self.names]
+        self.exact = {}
+        for i, key in enumerate(self.folded):
+            self.exact.setdefault(key, i)
+
+        # (key, name id) for the whole name and every later word start
+        keys = set()
+        for i, key in enumerate(self.folded):
+            keys.add((key, i))
+            for j, ch in enumerate(key):
+                if j and not key[j - 1].isalnum() and ch.isalnum():
+                    keys.add((key[j:], i))
+        self._prefix_keys = sorted(keys)
+        self._prefix_strings = [key for key, _ in self._prefix_keys]
+
+        self._grams = {}
+        for i, key in enumerate(self.folded):
+            for gram in _trigrams(key):
+                self._grams.setdefault(gram, []).append(i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, text):
+        """Position of the exactly matching name (accent/case-insensitive), or None."""
+        return self.exact.get(fold(text))
+
+    # As-you-type completion
+    def complete(self, prefix, limit=DEFAULT_LIMIT):
+        """Positions of names starting with prefix (or with a word starting with it), shortest first."""
+        prefix = fold(prefix)
+        if not prefix:
+            return []
+        start = bisect_left(self._prefix_strings, prefix)
+        seen = {}
+        for key, i in self._prefix_keys[start:]:
+            if not key.startswith(prefix):
+                break
+            # Whole-name matches rank ahead of word-start matches
+            rank = (key != self.folded[i], len(self.folded[i]), self.folded[i])
+            if i not in seen or rank < seen[i]:
+                seen[i] = rank
+        return sorted(seen, key=seen.get)[:limit]
+
+    # Typo-tolerant lookup
+    def search(self, text, limit=DEFAULT_LIMIT):
+        """Return [(position, score)] best first; score is 1.0 for an exact match and falls with edits.
+
+        Exact and prefix matches come first, then names sharing trigrams with
+        text, ranked by edit distance (against the name's start when the name
+        is much longer, so partially typed misspellings still match).
+        """
+        query = fold(text)
+        if not query:
+            return []
+        results = {}
+        exact = self.exact.get(query)
+        if exact is not None:
+            results[exact] = 1.0
+        for i in self.complete(query, limit):
+            results.setdefault(i, 0.9 * len(query) / max(len(self.folded[i]), 1) + 0.05)
+
+        if len(results) < limit and len(query) >= MIN_FUZZY_LENGTH:
+            shared = {}
+            # No end padding: the query may be the start of a longer name
+            for gram in _trigrams(query, end=""):
+                for i in self._grams.get(gram, ()):
+                    shared[i] = shared.get(i, 0) + 1
+            # Dice-style overlap; a name has len + 2 padded trigrams
+            candidates = heapq.nlargest(RERANK, shared, key=lambda i: shared[i] / (len(query) + len(self.folded[i]) + 4))
+            max_edits = max(1, len(query) // 3)
+            for i in candidates:
+                if i in results:
+                    continue
+                # Names much longer than the query are compared on their start, so typos
+                # are forgiven while still typing; the score is scaled down to match
+                name = self.folded[i]
+                targets = (name, name[:len(query)]) if len(name) > len(query) else (name,)
+                for target in targets:
+                    distance = _edit_distance(query, target, max_edits)
+                    if distance <= max_edits:
+                        score = 0.85 * (1 - distance / max(len(query), len(target))) * len(target) / len(name)
+                        results[i] = max(score, results.get(i, 0.0))
+
+        ranked = sorted(results.items(), key=lambda item: (-item[1], len(self.folded[item[0]])))
+        return ranked[:limit]
@@ -0,0 +1,233 @@
+"""Pareto fronts of teams over several stats and type coverage at once.
+
+``search.optimize_team`` folds stat, coverage and weaknesses into one weighted
+score. This module returns the teams for which no other team is at least as good
+on every objective and better on one. The objectives are the summed team stats
+(by default hp, attack, defense and speed) and the number of defending types
+the team hits super-effectively. Members may not share a type, as in the
+greedy selector, and the pool is the usual generation/level/excluded-type one.
+
+Every candidate is reduced once to a vector: its stats, an 18-bit coverage
+mask and a type mask. A species is dropped when another species has at least
+its stats, covers a superset of its types and uses a subset of its own types
+(it could always take its place). Teams then grow one slot at a time: every
+kept partial team is extended by every compatible species and extensions
+dominated by a partial team using a subset of their types are pruned. This
+loses no front team, so while every step fits in beam_width the result is
+the exact front. Real pools usually outgrow the beam: the step then falls
+back to plain dominance and is thinned by crowding distance (keeping the
+extremes of each objective), and the result is only an approximation (some
+listed teams may be beaten by teams that were thinned away, and the list is
+capped at beam_width). ``stats['truncated']`` says which case applies; widen
+the beam for a denser, more accurate front.
+
+    front = pareto_front(pokedex, generation=1, max_level=50)
+    for entry in front["teams"]:
+        print(entry["objectives"], [pokemon.name for pokemon in entry["team"]])
+
+    python -m teambuilder.pareto --generation 1 --max-level 50 --stats hp,attack,speed
+"""
+import argparse
+import time
+
+import numpy as np
+
+from teambuilder import engine
+
+DEFAULT_STATS = ("hp", "attack", "defense", "speed")
+COVERAGE = "coverage"
+DEFAULT_BEAM_WIDTH = 256
+# Rows compared at once in nondominated
+BLOCK = 256
+
+
+def _covers(a, b):
+    """(len(a), len(b)) bool matrix: row i of a is >= row j of b in every column."""
+    result = a[:, None, 0] >= b[None, :, 0]
+    for k in range(1, a.shape[1]):
+        result &= a[:, None, k] >= b[None, :, k]
+    return result
+
+
+def nondominated(values, masks=None):
+    """Indexes of the rows of values not weakly dominated by another row (all objectives maximized).
+
+    With masks (one int bitmask per row), a row only dominates rows whose mask
+    contains its own, so a partial team is never dropped for one that uses
+    types it could still have added. Of several identical rows (and masks)
+    only the first is kept. Rows are visited in descending sum order (fewest
+    mask bits first on ties) in blocks, each compared with the front kept so
+    far and within itself, so only kept points are ever compared against.
+    """
+    values = np.asarray(values)
+    if masks is None:
+        order = np.argsort(-values.sum(axis=1), kind="stable")
+        masks = np.zeros(len(values), dtype=np.int64)
+    else:
+        masks = np.asarray(masks, dtype=np.int64)
+        order = np.lexsort((_bit_count(masks), -values.sum(axis=1)))
+    front = np.empty((0, values.shape[1]), dtype=values.dtype)
+    front_masks = np.empty(0, dtype=np.int64)
+    kept = []
+    for start in range(0, len(order), BLOCK):
+        block = order[start:start + BLOCK]
+        rows, row_masks = values[block], masks[block]
+        alive = ~(_covers(front, rows) & _subset(front_masks, row_masks)).any(axis=0)
+        # A row earlier in the (sum-sorted) block that is >= everywhere dominates it
+        alive &= ~np.triu(_covers(rows, rows) & _subset(row_masks, row_masks), k=1).any(axis=0)
+        kept.extend(block[alive].tolist())
+        front = np.concatenate([front, rows[alive]])
+        front_masks = np.concatenate([front_masks, row_masks[alive]])
+    return np.array(kept, dtype=np.intp)
+
+
+def _subset(a, b):
+    """(len(a), len(b)) bool matrix: mask a[i] is contained in mask b[j]."""
+    return (a[:, None] & b[None, :]) == a[:, None]
+
+
+def crowding_distance(values):
+    """NSGA-II crowding distance of each row; the extremes of every objective get infinity."""
+    values = np.asarray(values, dtype=float)
+    distance = np.zeros(len(values))
+    for column in values.T:
+        order = np.argsort(column, kind="stable")
+        spread = column[order[-1]] - column[order[0]]
+        distance[order[[0, -1]]] = np.inf
+        if spread > 0 and len(values) > 2:
+            distance[order[1:-1]] += (column[order[2:]] - column[order[:-2]]) / spread
+    return distance
+
+
+def _thin(values, width):
+    """Indexes of at most width rows, keeping the least crowded."""
+    if len(values) <= width:
+        return np.arange(len(values))
+    return np.sort(np.argsort(-crowding_distance(values), kind="stable")[:width])
+
+
+def species_vectors(pokedex, pool, stats=DEFAULT_STATS):
+    """Per-candidate arrays for the search: objective stats, coverage and type masks."""
+    return {
+        "positions": np.asarray(pool, dtype=np.intp),
+        "stats": np.stack([pokedex.records.column(stat)[pool].astype(np.int32) for stat in stats], axis=1),
+        "cover": np.array(engine.bitmasks(pokedex.coverage[pool] > 1), dtype=np.int64),
+        "types": pokedex.type_bits[pool],
+    }
+
+
+def prune_species(vectors):
+    """Drop candidates that another candidate can always replace; returns the kept indexes."""
+    stats, cover, types = vectors["stats"], vectors["cover"], vectors["types"]
+    better = (_covers(stats, stats)
+              & ((cover[:, None] & cover[None, :]) == cover[None, :])
+              & ((types[:, None] & types[None, :]) == types[:, None]))
+    # Of two interchangeable candidates keep the earlier (better prioritized stat) one
+    equal = better & better.T
+    np.fill_diagonal(better, False)
+    dominated = (better & ~np.tril(equal)).any(axis=0)
+    return np.flatnonzero(~dominated)
+
+
+def _bit_count(masks):
+    """Set bits per int64 mask."""
+    return np.unpackbits(np.ascontiguousarray(masks, dtype=np.int64).view(np.uint8)).reshape(-1, 64).sum(axis=1, dtype=np.int32)
+
+
+# Compute the Pareto front (exact unless the beam truncated it) for one set of filters
+def pareto_front(pokedex, generation, max_level, stats=DEFAULT_STATS, excluded_types=None,
+                 beam_width=DEFAULT_BEAM_WIDTH):
+    """Return the front as a dict.
+
+    'objectives' names the columns (the stats, then 'coverage'); 'teams' is a
+    list of {'team': PokemonRecords, 'objectives': [values]} sorted by
+    coverage then summed stats, best first; 'stats' reports candidates before
+    and after species pruning, partial teams kept per slot, 'truncated' (True
+    when the beam thinned a step, so the front is approximate) and seconds.
+    """
+    started = time.perf_counter()
+    stats = [engine.normalize_stat(stat) for stat in stats]
+    if not stats or None in stats:
+        raise ValueError("At least one stat objective is required.")
+    pool = engine.candidate_pool(pokedex, generation, max_level, None, excluded_types)
+    vectors = species_vectors(pokedex, pool, stats)
+    kept = prune_species(vectors) if len(pool) else np.empty(0, dtype=np.intp)
+    positions = vectors["positions"][kept]
+    species_stats, cover, types = vectors["stats"][kept], vectors["cover"][kept], vectors["types"][kept]
+
+    # Partial teams: members (sorted candidate indexes), summed stats, coverage and type masks
+    members = np.empty((1, 0), dtype=np.intp)
+    team_stats = np.zeros((1, len(stats)), dtype=np.int32)
+    team_cover = np.zeros(1, dtype=np.int64)
+    team_types = np.zeros(1, dtype=np.int64)
+    frontier_sizes = []
+    truncated = False
+    slots = min(engine.TEAM_SIZE, len(positions))
+    for slot in range(slots):
+        parent, child = np.nonzero((team_types[:, None] & types[None, :]) == 0)
+        if not len(parent):
+            break
+        members = np.sort(np.column_stack([members[parent], child]), axis=1)
+        members, unique = np.unique(members, axis=0, return_index=True)
+        parent, child = parent[unique], child[unique]
+        team_stats = team_stats[parent] + species_stats[child]
+        team_cover = team_cover[parent] | cover[child]
+        team_types = team_types[parent] | types[child]
+
+        objectives = np.column_stack([team_stats, _bit_count(team_cover)])
+        # Until the last slot, a partial team only dominates teams whose types contain its own,
+        # which loses no front team; when that frontier outgrows the beam, fall back to plain
+        # dominance and thin by crowding, and the result becomes an approximation
+        keep = nondominated(objectives, None if slot == slots - 1 else team_types)
+        if len(keep) > beam_width:
+            truncated = True
+            keep = nondominated(objectives)
+            keep = keep[_thin(objectives[keep], beam_width)]
+        members, team_stats = members[keep], team_stats[keep]
+        team_cover, team_types = team_cover[keep], team_types[keep]
+        frontier_sizes.append(len(keep))
+
+    teams = []
+    if frontier_sizes:
+        objectives = np.column_stack([team_stats, _bit_count(team_cover)])
+        for i in np.lexsort((team_stats.sum(axis=1), objectives[:, -1]))[::-1]:
+            teams.append({"team": pokedex.records.take(positions[members[i]]),
+                          "objectives": objectives[i].tolist()})
+    return {
+        "objectives": stats + [COVERAGE],
+        "teams": teams,
+        "stats": {"candidates": len(pool), "kept_species": len(positions), "frontier_sizes": frontier_sizes,
+                  "truncated": truncated, "seconds": time.perf_counter() - started},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the Pareto-optimal teams over several stats and coverage "
+                                                 "(exact, or a beam approximation when the pool outgrows the beam).")
+    parser.add_argument("--generation", type=int, required=True)
+    parser.add_argument("--max-level", type=int, required=True)
+    parser.add_argument("--stats", default=",".join(DEFAULT_STATS), help="','-separated stat objectives")
+    parser.add_argument("--exclude", default="", help="';'-separated excluded types")
+    parser.add_argument("--beam-width", type=int, default=DEFAULT_BEAM_WIDTH,
+                        help="partial teams kept per slot; also caps the teams listed (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    pokedex = engine.load_pokedex()
+    try:
+        front = pareto_front(pokedex, args.generation, args.max_level,
+                             [s.strip() for s in args.stats.split(",") if s.strip()],
+                             engine.parse_types(args.exclude), args.beam_width)
+    except ValueError as e:
+        parser.error(str(e))
+    print("  ".join(f"{name:>9}" for name in front["objectives"]) + "  team")
+    for entry in front["teams"]:
+        print("  ".join(f"{value:>9}" for value in entry["objectives"]) + "  "
+              + ", ".join(pokemon.name for pokemon in entry["team"]))
+    stats = front["stats"]
+    kind = "approximate front (truncated by the beam)" if stats["truncated"] else "exact front"
+    print(f"{len(front['teams'])} teams on the {kind}; {stats['kept_species']}/{stats['candidates']} species "
+          f"after pruning, {stats['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compact array-backed Pokémon records.
+
+The engine only needs a handful of the 41 ``pokemon.csv`` columns, so the
+store keeps those as typed NumPy columns (int16 stats, int8 type ids and
+generation) plus an interned name table. Team members are lightweight
+``__slots__`` records created once per species and shared by every team, so
+building a team allocates nothing but a list. ``RecordStore.to_frame`` turns
+records back into DataFrame rows when a report or plot needs them.
+"""
+import sys
+
+import numpy as np
+
+from teambuilder.typechart import NO_TYPE
+
+STAT_COLUMNS = ("hp", "attack", "defense", "sp_attack", "sp_defense", "speed", "base_total")
+
+
+class PokemonRecord:
+    """One species as seen by the engine; a read-only view into the store."""
+
+    __slots__ = ("position", "name", "type1", "type2", "type1_id", "type2_id", "generation",
+                 "hp", "attack", "defense", "sp_attack", "sp_defense", "speed", "base_total")
+
+    def __init__(self, position, name, type1, type2, type1_id, type2_id, generation, stats):
+        self.position = position
+        self.name = name
+        self.type1 = type1
+        self.type2 = type2
+        self.type1_id = type1_id
+        self.type2_id = type2_id
+        self.generation = generation
+        (self.hp, self.attack, self.defense, self.sp_attack,
+         self.sp_defense, self.speed, self.base_total) = stats
+
+    def __repr__(self):
+        return f"PokemonRecord({self.name!r}, {self.type1}/{self.type2 or '-'})"
+
+    def types(self):
+        """The species' type names (one or two)."""
+        return (self.type1,) if self.type2 is None else (self.type1, self.type2)
+
+    def stat(self, column):
+        return getattr(self, column)
+
+
+class RecordStore:
+    """Typed column arrays for the pokedex plus one shared record per row."""
+
+    def __init__(self, df, type_matrix, type1_ids, type2_ids):
+        self._df = df
+        # Interned so equal names share one string object across teams and caches
+        self.names = [sys.intern(str(name)) for name in df['name']]
+        self.type_names = list(type_matrix.types)
+        self.type1 = type1_ids
+        self.type2 = type2_ids
+        self.generation = df['generation'].to_numpy(dtype=np.int8)
+        self.stats = {column: df[column].to_numpy(dtype=np.int16) for column in STAT_COLUMNS}
+        self.records = [self._make_record(i) for i in range(len(df))]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, position):
+        return self.records[position]
+
+    def _make_record(self, i):
+        type1_id, type2_id = int(self.type1[i]), int(self.type2[i])
+        return PokemonRecord(
+            i, self.names[i],
+            self.type_names[type1_id] if type1_id != NO_TYPE else None,
+            self.type_names[type2_id] if type2_id != NO_TYPE else None,
+            type1_id, type2_id, int(self.generation[i]),
+            tuple(int(self.stats[column][i]) for column in STAT_COLUMNS),
+        )
+
+    def column(self, column):
+        """Typed array for a stat column, or the generation column."""
+        if column == "generation":
+            return self.generation
+        return self.stats[column]
+
+    def take(self, positions):
+        """Records for a sequence of row positions."""
+        return [self.records[i] for i in positions]
+
+    def to_frame(self, team):
+        """Full pokedex rows (DataFrame) for a list of records."""
+        return self._df.iloc[[pokemon.position for pokemon in team]]
@@ -0,0 +1,155 @@
+"""Seeded random team sampling from the constrained candidate pool.
+
+``engine.generate_team`` always returns the same team for the same filters.
+A ``TeamSampler`` draws many different valid teams instead: it resolves the
+pool once (``engine.candidate_pool``), turns the prioritized stat into
+sampling weights and each candidate's types into a bitmask, and then fills all
+requested teams slot by slot in array operations. Each pick is a weighted draw
+(Gumbel-max) among the candidates that share no type with the team so far,
+or that have a preferred type, which is the same rule the greedy selector uses.
+The same seed always gives the same teams.
+
+    sampler = TeamSampler(pokedex, generation=1, max_level=50, prioritized_stat="attack")
+    teams = sampler.sample(20, seed=7)
+
+    python -m teambuilder.sampling --generation 1 --max-level 50 --stat attack -n 10 --seed 7
+    python -m teambuilder.sampling --generation 4 --max-level 100 -n 20000 --stats
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from teambuilder import engine
+
+DEFAULT_STAT = "base_total"
+# Weights are (stat / best stat in pool) ** sharpness; 0 samples uniformly
+DEFAULT_SHARPNESS = 4.0
+# Draws attempted per requested team before sample(unique=True) gives up
+MAX_ATTEMPTS = 8
+
+
+class TeamSampler:
+    """Weighted, type-diverse random teams for one set of filters."""
+
+    def __init__(self, pokedex, generation, max_level, prioritized_stat=None, preferred_types=None,
+                 excluded_types=None, locked_team=None, sharpness=DEFAULT_SHARPNESS):
+        self.pokedex = pokedex
+        self.locked = engine.resolve_team(pokedex, locked_team)[:engine.TEAM_SIZE]
+        stat = engine.normalize_stat(prioritized_stat) or DEFAULT_STAT
+        pool = engine.candidate_pool(pokedex, generation, max_level, stat, excluded_types)
+        locked_positions = [pokemon.position for pokemon in self.locked]
+        self.pool = pool[~np.isin(pool, locked_positions)]
+
+        stats = pokedex.records.column(stat)[self.pool].astype(float)
+        self.log_weights = sharpness * np.log(np.maximum(stats, 1.0) / max(stats.max(initial=1.0), 1.0))
+        self.type_bits = pokedex.type_bits[self.pool]
+        self.preferred = pokedex.rows_with_types(preferred_types or [])[self.pool]
+        self.locked_bits = 0
+        for pokemon in self.locked:
+            self.locked_bits |= int(pokedex.type_bits[pokemon.position])
+        self.slots = min(engine.TEAM_SIZE - len(self.locked), len(self.pool))
+
+    def __len__(self):
+        return len(self.pool)
+
+    def sample_positions(self, n, rng):
+        """Draw n teams as an (n, slots) array of pool indexes; -1 marks a slot no candidate could fill."""
+        chosen = np.full((n, self.slots), -1, dtype=np.intp)
+        if not self.slots:
+            return chosen
+        used = np.full(n, self.locked_bits, dtype=np.int64)
+        taken = np.zeros((n, len(self.pool)), dtype=bool)
+        rows = np.arange(n)
+        for slot in range(self.slots):
+            allowed = ~taken & (((self.type_bits[None, :] & used[:, None]) == 0) | self.preferred[None, :])
+            keys = np.where(allowed, self.log_weights + rng.gumbel(size=taken.shape), -np.inf)
+            pick = keys.argmax(axis=1)
+            ok = allowed[rows, pick]
+            chosen[ok, slot] = pick[ok]
+            taken[rows[ok], pick[ok]] = True
+            used[ok] |= self.type_bits[pick[ok]]
+        return chosen
+
+    def sample(self, n=1, seed=None, unique=True):
+        """Return n teams (lists of PokemonRecords, locked members first).
+
+        seed is an int, a numpy Generator or None (fresh entropy). With unique,
+        repeated teams are redrawn; fewer than n are returned when the pool
+        cannot produce that many distinct teams, and none when there is
+        nothing to draw from and no locked team.
+        """
+        if not len(self.pool) and not self.locked:
+            return []
+        rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        teams, seen = [], set()
+        for _ in range(MAX_ATTEMPTS):
+            for row in self.sample_positions(n - len(teams), rng):
+                members = row[row >= 0]
+                key = frozenset(members.tolist())
+                if unique and key in seen:
+                    continue
+                seen.add(key)
+                teams.append(self.locked + self.pokedex.records.take(self.pool[members]))
+            if len(teams) >= n or not unique:
+                break
+        return teams
+
+
+# Draw teams for one set of filters
+def sample_teams(pokedex, n, generation, max_level, prioritized_stat=None, preferred_types=None,
+                 excluded_types=None, locked_team=None, seed=None, sharpness=DEFAULT_SHARPNESS, unique=True):
+    """Return up to n distinct sampled teams; raises ValueError for invalid filters."""
+    sampler = TeamSampler(pokedex, generation, max_level, prioritized_stat, preferred_types,
+                          excluded_types, locked_team, sharpness)
+    return sampler.sample(n, seed, unique)
+
+
+# One team for the GUI's Random Team button
+def sample_team(pokedex, generation, max_level, seed=None, **filters):
+    """Return one sampled team (a list of PokemonRecords), or [] when nothing matches the filters."""
+    teams = sample_teams(pokedex, 1, generation, max_level, seed=seed, **filters)
+    return teams[0] if teams else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sample random, type-diverse teams for one set of filters.")
+    parser.add_argument("--generation", type=int, required=True)
+    parser.add_argument("--max-level", type=int, required=True)
+    parser.add_argument("--stat", default=None, help="prioritized stat used as the sampling weight (default base_total)")
+    parser.add_argument("--prefer", default="", help="';'-separated preferred types")
+    parser.add_argument("--exclude", default="", help="';'-separated excluded types")
+    parser.add_argument("-n", type=int, default=10, help="teams to draw")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--sharpness", type=float, default=DEFAULT_SHARPNESS,
+                        help="how strongly the stat skews the draw (0: uniform)")
+    parser.add_argument("--stats", action="store_true",
+                        help="print member frequencies and throughput instead of the teams")
+    args = parser.parse_args(argv)
+
+    pokedex = engine.load_pokedex()
+    try:
+        sampler = TeamSampler(pokedex, args.generation, args.max_level, args.stat, engine.parse_types(args.prefer),
+                              engine.parse_types(args.exclude), sharpness=args.sharpness)
+    except ValueError as e:
+        parser.error(str(e))
+    started = time.perf_counter()
+    teams = sampler.sample(args.n, args.seed, unique=not args.stats)
+    elapsed = time.perf_counter() - started
+
+    if not args.stats:
+        for team in teams:
+            print(", ".join(pokemon.name for pokemon in team))
+    else:
+        counts = Counter(pokemon.name for team in teams for pokemon in team)
+        distinct = len({frozenset(pokemon.position for pokemon in team) for team in teams})
+        print(f"{len(teams)} teams ({distinct} distinct) from a pool of {len(sampler)}")
+        for name, count in counts.most_common(15):
+            print(f"  {name:<14} {count / len(teams):6.1%}")
+    print(f"Sampled {len(teams)} teams in {elapsed:.3f}s ({len(teams) / max(elapsed, 1e-9):,.0f}/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Coverage-optimal team search with branch-and-bound.
+
+Instead of filling six slots greedily in stat order, this searches every
+valid team for the one that maximizes::
+
+    stat_weight     * (summed prioritized stat / (6 * best stat in pool))
+  + coverage_weight * (defending types hit super-effectively / 18)
+  - weakness_weight * (attacking types that hit 2+ members super-effectively / 18)
+
+under the same generation, level, preferred-type and excluded-type filters
+as ``engine.generate_team``. The type rule mirrors the greedy selector: a
+member that has none of the preferred types may not share a type with any
+other member, while members with a preferred type may repeat types.
+
+Coverage and weaknesses are 18-bit masks per species, so a node costs a few
+integer operations. A node is pruned when an optimistic bound (best remaining
+stats + best possible new coverage, current weaknesses) cannot beat the best
+team found so far.
+"""
+import time
+
+import numpy as np
+
+from teambuilder import engine
+
+DEFAULT_STAT = "base_total"
+DEFAULT_WEIGHTS = {"stat": 1.0, "coverage": 1.0, "weakness": 1.0}
+
+
+def _prepare(pokedex, pool, stat, preferred_types):
+    """Per-candidate arrays/masks, dropping candidates that can never be picked."""
+    positions = pool
+    stat_values = pokedex.records.column(stat)[pool].astype(float)
+    type1 = pokedex.type1_ids[positions]
+    type2 = pokedex.type2_ids[positions]
+    preferred_ids = {pokedex.type_matrix.ids[t] for t in engine.normalize_types(preferred_types)
+                     if t in pokedex.type_matrix.ids}
+
+    kept = []
+    per_type_set = {}
+    # pool is sorted best stat first; only the best member of each type set can
+    # ever be used, except for preferred types which may repeat
+    for i in np.argsort(-stat_values, kind="stable"):
+        type_set = frozenset(t for t in (int(type1[i]), int(type2[i])) if t >= 0)
+        limit = engine.TEAM_SIZE if type_set & preferred_ids else 1
+        if per_type_set.get(type_set, 0) < limit:
+            per_type_set[type_set] = per_type_set.get(type_set, 0) + 1
+            kept.append(i)
+    kept = np.array(kept, dtype=np.intp)
+
+    positions = positions[kept]
+    type1, type2 = type1[kept], type2[kept]
+    type_bits = [int(bits) for bits in pokedex.type_bits[positions]]
+    return {
+        "positions": positions,
+        "stat": stat_values[kept],
+        "cover": engine.bitmasks(pokedex.coverage[positions] > 1),
+        "weak": engine.bitmasks(pokedex.defense[positions] > 1),
+        "types": type_bits,
+        "preferred": [bool(bits & sum(1 << t for t in preferred_ids)) for bits in type_bits],
+    }
+
+
+# Search for the best team under the filters and weighted objective
+def optimize_team(pokedex, generation, max_level, prioritized_stat=None, preferred_types=None,
+                  excluded_types=None, weights=None, max_nodes=2_000_000):
+    """Return the best team found and the search stats.
+
+    weights overrides any of DEFAULT_WEIGHTS ('stat', 'coverage', 'weakness').
+    The result is a dict with 'team' (list of PokemonRecords), 'score', 'coverage',
+    'shared_weaknesses' and 'stats' (nodes expanded, branches a bound cut off,
+    candidates, seconds, and 'complete', False if max_nodes stopped the search early).
+    """
+    started = time.perf_counter()
+    stat = engine.normalize_stat(prioritized_stat) or DEFAULT_STAT
+    preferred_types = list(preferred_types or [])
+    w = dict(DEFAULT_WEIGHTS, **(weights or {}))
+
+    pool = engine.candidate_pool(pokedex, generation, max_level, stat, excluded_types)
+    if not len(pool):
+        return {"team": [], "score": 0.0, "coverage": 0, "shared_weaknesses": 0,
+                "stats": {"nodes_expanded": 0, "nodes_pruned": 0, "candidates": 0,
+                          "seconds": time.perf_counter() - started, "complete": True}}
+
+    data = _prepare(pokedex, pool, stat, preferred_types)
+    n = len(data["positions"])
+    stats_arr = data["stat"]
+    scale = max(stats_arr.max(), 1.0) * engine.TEAM_SIZE
+    n_types = len(pokedex.type_matrix)
+    stat_w = w["stat"] / scale
+    cover_w = w["coverage"] / n_types
+    weak_w = w["weakness"] / n_types
+    size = min(engine.TEAM_SIZE, n)
+
+    stats_list = [float(v) for v in stats_arr]
+    cover, weak, types, preferred = data["cover"], data["weak"], data["types"], data["preferred"]
+    # Candidates are sorted by stat, so the best r stats from i on are a prefix-sum slice
+    stat_prefix = [0.0] + list(np.cumsum(stats_arr))
+    # Everything candidates i.. could still cover, for the cheap coverage bound
+    cover_suffix = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        cover_suffix[i] = cover_suffix[i + 1] | cover[i]
+
+    def fits(i, all_types, exclusive):
+        return not types[i] & (exclusive if preferred[i] else all_types)
+
+    def score(stat_sum, covered, weak2):
+        return stat_w * stat_sum + cover_w * covered.bit_count() - weak_w * weak2.bit_count()
+
+    def cheap_bound(start, remaining, stat_sum, covered, weak2):
+        stat_ub = stat_sum + stat_prefix[min(start + remaining, n)] - stat_prefix[start]
+        return score(stat_ub, covered | cover_suffix[start], weak2)
+
+    def tight_bound(start, remaining, stat_sum, covered, weak2):
+        """Like cheap_bound, but only the r best coverage gains can be added."""
+        stat_ub = stat_sum + stat_prefix[min(start + remaining, n)] - stat_prefix[start]
+        uncovered = ~covered
+        gains = sorted(((cover[j] & uncovered).bit_count() for j in range(start, n)), reverse=True)
+        cover_ub = min(n_types, covered.bit_count() + sum(gains[:remaining]))
+        return stat_w * stat_ub + cover_w * cover_ub - weak_w * weak2.bit_count()
+
+    # Seed the incumbent with a greedy pass on the same objective
+    members, stat_sum, covered, weak1, weak2, all_types, exclusive = [], 0.0, 0, 0, 0, 0, 0
+    while len(members) < size:
+        pick, pick_score = None, -np.inf
+        for i in range(n):
+            if i in members or not fits(i, all_types, exclusive):
+                continue
+            s = score(stat_sum + stats_list[i], covered | cover[i], weak2 | (weak1 & weak[i]))
+            if s > pick_score:
+                pick, pick_score = i, s
+        if pick is None:
+            break
+        members.append(pick)
+        stat_sum += stats_list[pick]
+        covered |= cover[pick]
+        weak2 |= weak1 & weak[pick]
+        weak1 |= weak[pick]
+        all_types |= types[pick]
+        if not preferred[pick]:
+            exclusive |= types[pick]
+    best = {"score": score(stat_sum, covered, weak2), "members": tuple(members)}
+    target = len(members)
+
+    counters = {"nodes_expanded": 0, "nodes_pruned": 0}
+
+    def expand(start, chosen, stat_sum, covered, weak1, weak2, all_types, exclusive):
+        counters["nodes_expanded"] += 1
+        remaining = target - len(chosen)
+        if tight_bound(start, remaining, stat_sum, covered, weak2) <= best["score"]:
+            counters["nodes_pruned"] += 1
+            return
+        for i in range(start, n - remaining + 1):
+            # Bounds only shrink as i grows, so one failed check ends the loop; count the
+            # branches that cut off (candidates that could still have joined), if any
+            if cheap_bound(i, remaining, stat_sum, covered, weak2) <= best["score"]:
+                counters["nodes_pruned"] += sum(fits(j, all_types, exclusive) for j in range(i, n - remaining + 1))
+                return
+            if not fits(i, all_types, exclusive):
+                continue
+            child = (stat_sum + stats_list[i], covered | cover[i], weak1 | weak[i], weak2 | (weak1 & weak[i]))
+            chosen.append(i)
+            if remaining == 1:
+                s = score(child[0], child[1], child[3])
+                if s > best["score"]:
+                    best["score"], best["members"] = s, tuple(chosen)
+            elif counters["nodes_expanded"] < max_nodes:
+                expand(i + 1, chosen, *child, all_types | types[i],
+                       exclusive if preferred[i] else exclusive | types[i])
+            chosen.pop()
+
+    if target:
+        expand(0, [], 0.0, 0, 0, 0, 0, 0)
+
+    members = list(best["members"])
+    team = pokedex.records.take(data["positions"][members])
+    covered = weak1 = weak2 = 0
+    for i in members:
+        covered |= cover[i]
+        weak2 |= weak1 & weak[i]
+        weak1 |= weak[i]
+    return {
+        "team": team,
+        "score": float(best["score"]),
+        "coverage": covered.bit_count(),
+        "shared_weaknesses": weak2.bit_count(),
+        "stats": {
+            "nodes_expanded": counters["nodes_expanded"],
+            "nodes_pruned": counters["nodes_pruned"],
+            "candidates": n,
+            "seconds": time.perf_counter() - started,
+            "complete": counters["nodes_expanded"] < max_nodes,
+        },
+    }
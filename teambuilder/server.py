@@ -0,0 +1,314 @@
+"""Local HTTP/JSON team-building service.
+
+The pokedex is loaded once at startup and kept warm; every request is
+answered from memory. Team generation, swaps and analysis run on an executor
+(threads by default, or worker processes that each load the pokedex once), so
+a slow search never blocks other requests. Only loopback addresses are
+accepted as the bind host.
+
+    python -m teambuilder.server --port 8765
+
+Endpoints (JSON in, JSON out)::
+
+    GET  /health
+    GET  /lookup?name=pikachu
+    POST /generate  {"generation": 1, "max_level": 40, "prioritized_stat": "attack",
+                     "preferred_types": [], "excluded_types": [], "locked_team": [],
+                     "mode": "greedy" | "optimize" | "sample", "count": 10, "seed": 7}
+    POST /swap      {"team": ["Venusaur", ...], "slot": 2, "generation": 1, "max_level": 40, ...}
+    POST /analyze   {"team": ["Venusaur", ...]}
+
+Teams are returned as lists of rows keyed by ``engine.TEAM_COLUMNS``.
+``generation``, ``max_level``, ``count``, ``seed`` and ``slot`` must be JSON
+integers, and type lists, teams and names strings / lists of strings
+(anything else is a 400); type names are case-insensitive.
+"""
+import argparse
+import asyncio
+import contextlib
+import ipaddress
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from teambuilder import engine, sampling, search
+from teambuilder.typechart import score_teams
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1 << 20
+MAX_SAMPLES = 1000
+FILTER_KEYS = ("generation", "max_level", "prioritized_stat", "excluded_types")
+# Body keys that must hold an integer / a string / a list of strings when present
+INT_KEYS = ("generation", "max_level", "count", "seed", "slot")
+STRING_KEYS = ("prioritized_stat", "mode", "name")
+STRING_LIST_KEYS = ("preferred_types", "excluded_types", "locked_team", "team")
+
+class RequestError(Exception):
+    """A client error reported as a JSON body with the given HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _team_json(team):
+    return [dict(zip(engine.TEAM_COLUMNS, row)) for row in engine.team_rows(team)]
+
+
+# Reject bodies whose values have the wrong JSON shape before any handler sees them
+def _check_body(body):
+    for key in INT_KEYS:
+        value = body.get(key)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"'{key}' must be an integer.")
+    for key in STRING_KEYS:
+        if body.get(key) is not None and not isinstance(body[key], str):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"'{key}' must be a string.")
+    for key in STRING_LIST_KEYS:
+        value = body.get(key)
+        if value is not None and not (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"'{key}' must be a list of strings.")
+
+
+def _filters(body, keys=FILTER_KEYS):
+    if body.get("generation") is None or body.get("max_level") is None:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "'generation' and 'max_level' are required integers.")
+    return {key: body[key] for key in keys if body.get(key) is not None}
+
+
+# Request handlers; these run on the executor and use the warm engine.shared_pokedex()
+def generate(body):
+    """Build a team with the greedy selector, the branch-and-bound search (mode='optimize'), or draw
+    count random teams (mode='sample', reproducible with seed)."""
+    pokedex = engine.shared_pokedex()
+    filters = _filters(body, FILTER_KEYS + ("preferred_types",))
+    mode = body.get("mode", "greedy")
+    if mode == "optimize":
+        result = search.optimize_team(pokedex, **filters)
+        return {"team": _team_json(result["team"]), "score": result["score"],
+                "coverage": result["coverage"], "shared_weaknesses": result["shared_weaknesses"],
+                "search": result["stats"]}
+    if mode == "sample":
+        count = 1 if body.get("count") is None else body["count"]
+        if not 1 <= count <= MAX_SAMPLES:
+            raise ValueError(f"'count' must be between 1 and {MAX_SAMPLES}.")
+        teams = sampling.sample_teams(pokedex, count, locked_team=body.get("locked_team"),
+                                      seed=body.get("seed"), **filters)
+        return {"teams": [_team_json(team) for team in teams]}
+    if mode != "greedy":
+        raise ValueError(f"Unknown mode: {mode}")
+    team = engine.generate_team(pokedex, locked_team=body.get("locked_team"), **filters)
+    return {"team": _team_json(team)}
+
+
+def swap(body):
+    """Replace one slot of the given team with the best alternative under the filters."""
+    pokedex = engine.shared_pokedex()
+    team = engine.resolve_team(pokedex, body.get("team"))
+    slot = body.get("slot")
+    if slot is None:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "'slot' is required.")
+    new_team = engine.swap_pokemon(pokedex, team, slot, **_filters(body))
+    if new_team is None:
+        return {"team": _team_json(team), "swapped": False}
+    return {"team": _team_json(new_team), "swapped": True, "replacement": new_team[slot].name}
+
+
+def analyze(body):
+    """Text analysis plus the team's coverage and weakness counts."""
+    pokedex = engine.shared_pokedex()
+    team = engine.resolve_team(pokedex, body.get("team"))
+    analysis = engine.analyze_team(team, pokedex.type_matrix)
+    type1 = np.array([[pokemon.type1_id for pokemon in team]], dtype=np.int8)
+    type2 = np.array([[pokemon.type2_id for pokemon in team]], dtype=np.int8)
+    scores = {key: int(values[0]) for key, values in score_teams(pokedex.type_matrix, type1, type2).items()}
+    return dict(scores, team=_team_json(team), analysis=analysis)
+
+
+def lookup(body):
+    """One Pokémon's table row, type ids and full stats."""
+    pokedex = engine.shared_pokedex()
+    name = str(body.get("name") or "")
+    pokemon = engine.find_pokemon(pokedex, name)
+    if pokemon is None:
+        close = engine.suggest_pokemon(pokedex, name, limit=1)
+        hint = f" (did you mean {close[0].name}?)" if close else ""
+        raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown Pokémon: {name}{hint}")
+    stats = {column: pokemon.stat(column) for column in
+             ("hp", "attack", "defense", "sp_attack", "sp_defense", "speed", "base_total")}
+    return dict(_team_json([pokemon])[0], generation=pokemon.generation, stats=stats)
+
+
+def health(body):
+    pokedex = engine.shared_pokedex()
+    return {"status": "ok", "pokemon": len(pokedex.records), "candidate_cache": pokedex.candidates.stats()}
+
+
+# path -> (methods, handler, runs on the executor)
+ROUTES = {
+    "/generate": (("POST",), generate, True),
+    "/swap": (("POST",), swap, True),
+    "/analyze": (("POST",), analyze, True),
+    "/lookup": (("GET", "POST"), lookup, False),
+    "/health": (("GET",), health, False),
+}
+
+
+class TeamService:
+    """Serves ROUTES over HTTP/1.1 with keep-alive, dispatching heavy handlers to an executor."""
+
+    def __init__(self, executor=None):
+        self.executor = executor
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        keep_alive = (headers.get("connection", "").lower() != "close") and version == "HTTP/1.1"
+        return method.upper(), target, body, keep_alive
+
+    async def dispatch(self, method, target, raw_body):
+        """Return (status, payload) for one request."""
+        url = urlsplit(target)
+        route = ROUTES.get(url.path.rstrip("/") or "/")
+        if route is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"No endpoint {url.path}")
+        methods, handler, heavy = route
+        if method not in methods:
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, f"{url.path} accepts {', '.join(methods)}")
+
+        body = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if raw_body:
+            try:
+                payload = json.loads(raw_body)
+            except ValueError:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON.")
+            if not isinstance(payload, dict):
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object.")
+            body.update(payload)
+        _check_body(body)
+
+        if heavy:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, handler, body)
+        else:
+            result = handler(body)
+        return HTTPStatus.OK, result
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, raw_body, keep_alive = request
+                    status, payload = await self.dispatch(method, target, raw_body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ValueError, IndexError, KeyError, TypeError) as e:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+def _check_local(host):
+    if host == "localhost":
+        return
+    try:
+        if ipaddress.ip_address(host).is_loopback:
+            return
+    except ValueError:
+        pass
+    raise ValueError(f"Refusing to listen on {host}: the service only binds to localhost.")
+
+
+def make_executor(processes=0, threads=None):
+    """Thread pool sharing the server's pokedex, or a process pool (processes > 0) with one per worker."""
+    if processes:
+        return engine.process_pool(processes)
+    return ThreadPoolExecutor(max_workers=threads or min(8, (os.cpu_count() or 1) + 2),
+                              thread_name_prefix="teambuilder-request")
+
+
+# Load the data once and serve until interrupted
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, executor=None, ready=None):
+    """Run the service; ready(server) is called once it is listening."""
+    _check_local(host)
+    engine.shared_pokedex()
+    service = TeamService(executor)
+    server = await asyncio.start_server(service.handle, host, port)
+    if ready is not None:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve team generation over local HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="loopback address to bind (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--threads", type=int, default=None, help="executor threads for heavy requests")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="use this many worker processes instead of threads (each loads the data once)")
+    args = parser.parse_args(argv)
+
+    try:
+        _check_local(args.host)
+    except ValueError as e:
+        parser.error(str(e))
+    executor = make_executor(args.processes, args.threads)
+
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        print(f"Serving on http://{address[0]}:{address[1]}", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(args.host, args.port, executor, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
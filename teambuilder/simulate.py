@@ -0,0 +1,239 @@
+"""Monte Carlo team-vs-team battles and round-robin win-rate matrices.
+
+A deliberately simple singles model built from the columns the engine
+already has: every species is taken at level 50 (base stat + IV 31, no EVs)
+and has one 80-power STAB move of its best type against the target, with the
+multiplier from the chart-reconciled matchup table (``pokedex.matchups.hit``).
+It uses its stronger category (attack/defense or sp_attack/sp_defense).
+Each turn the faster active Pokémon (speed ties are a coin flip) strikes
+first, and the other answers if it is still standing. Moves miss 10% of the
+time, crit 1/24 of the time for 1.5x, and roll 85-100% damage. A fainted
+Pokémon is replaced by the next team member in order, and the side that runs
+out loses. Battles still going after MAX_TURNS (e.g. mutual immunities)
+are draws.
+
+The species × species damage table is precomputed once, so a batch of
+battles only gathers from it; thousands of battles advance together one
+turn at a time. Round-robins split the pairings over a process pool:
+
+    python -m teambuilder.simulate teams.jsonl --sims 200 --workers 4 -o winrates.csv
+    python -m teambuilder.simulate team_a.csv team_b.csv --sims 5000 --seed 1
+"""
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+
+from teambuilder import engine
+from teambuilder.library import read_library
+
+LEVEL = 50
+POWER = 80
+STAB = 1.5
+ACCURACY = 0.9
+CRIT_CHANCE = 1 / 24
+CRIT_MULTIPLIER = 1.5
+MAX_TURNS = 200
+DEFAULT_SIMS = 200
+# Battles advanced together per chunk of a round-robin
+BATCH_BATTLES = 50_000
+
+# The battle model and round-robin teams of this worker, set by _set_teams
+_model = None
+_teams = None
+
+
+def _set_teams(teams):
+    global _model, _teams
+    if _model is None:
+        _model = BattleModel(engine.shared_pokedex())
+    _teams = teams
+
+
+class BattleModel:
+    """Level-50 HP, speed and the species × species damage table."""
+
+    def __init__(self, pokedex):
+        stats = {column: pokedex.records.column(column).astype(np.float32)
+                 for column in ("hp", "attack", "defense", "sp_attack", "sp_defense", "speed")}
+        half_iv = np.float32(31 / 2)
+        self.hp = stats["hp"] + half_iv + LEVEL + 10
+        level = {column: values + half_iv + 5 for column, values in stats.items() if column != "hp"}
+        self.speed = level["speed"]
+        ratio = np.maximum(level["attack"][:, None] / level["defense"][None, :],
+                           level["sp_attack"][:, None] / level["sp_defense"][None, :])
+        # damage[a, b]: average-roll hit of a on b before accuracy, crits and the random factor
+        self.damage = ((2 * LEVEL / 5 + 2) * POWER * ratio / 50 + 2) * STAB * pokedex.matchups.hit
+        self.damage = np.ascontiguousarray(self.damage, dtype=np.float32)
+
+    def _rolls(self, rng, n):
+        roll = rng.uniform(0.85, 1.0, n).astype(np.float32)
+        roll[rng.random(n) < CRIT_CHANCE] *= CRIT_MULTIPLIER
+        roll[rng.random(n) >= ACCURACY] = 0
+        return roll
+
+    def play(self, side_a, side_b, rng):
+        """Fight battles between matching rows of two (battles, 6) position arrays (-1 pads short teams).
+
+        Returns an int8 array: 1 where side a won, -1 where side b won, 0 for draws.
+        """
+        sides = (np.asarray(side_a, dtype=np.intp), np.asarray(side_b, dtype=np.intp))
+        n = len(sides[0])
+        hp = [np.where(side >= 0, self.hp[side.clip(0)], 0) for side in sides]
+        size = [(side >= 0).sum(axis=1) for side in sides]
+        active = [np.zeros(n, dtype=np.intp), np.zeros(n, dtype=np.intp)]
+        result = np.zeros(n, dtype=np.int8)
+        live = np.flatnonzero((size[0] > 0) & (size[1] > 0))
+        result[(size[0] > 0) & (size[1] == 0)] = 1
+        result[(size[0] == 0) & (size[1] > 0)] = -1
+
+        for _ in range(MAX_TURNS):
+            if not len(live):
+                break
+            slot_a, slot_b = active[0][live], active[1][live]
+            a, b = sides[0][live, slot_a], sides[1][live, slot_b]
+            hp_a, hp_b = hp[0][live, slot_a], hp[1][live, slot_b]
+            hit_ab = self.damage[a, b] * self._rolls(rng, len(live))
+            hit_ba = self.damage[b, a] * self._rolls(rng, len(live))
+            a_first = (self.speed[a] > self.speed[b]) | (
+                (self.speed[a] == self.speed[b]) & (rng.random(len(live)) < 0.5))
+            # The slower side only answers if the first hit left it standing
+            new_b = np.where(a_first | (hp_a > hit_ba), hp_b - hit_ab, hp_b)
+            new_a = np.where(~a_first | (hp_b > hit_ab), hp_a - hit_ba, hp_a)
+            hp[0][live, slot_a] = new_a
+            hp[1][live, slot_b] = new_b
+            active[0][live] += new_a <= 0
+            active[1][live] += new_b <= 0
+
+            a_out = active[0][live] >= size[0][live]
+            b_out = active[1][live] >= size[1][live]
+            result[live[b_out]] = 1
+            result[live[a_out]] = -1
+            live = live[~(a_out | b_out)]
+        return result
+
+
+def team_positions(teams):
+    """(teams, 6) array of row positions for lists of PokemonRecords, -1 padded."""
+    positions = np.full((len(teams), engine.TEAM_SIZE), -1, dtype=np.intp)
+    for i, team in enumerate(teams):
+        members = [pokemon.position for pokemon in team][:engine.TEAM_SIZE]
+        positions[i, :len(members)] = members
+    return positions
+
+
+# Many battles between two teams
+def simulate_matchup(pokedex, team_a, team_b, sims=1000, seed=None, model=None):
+    """Return win/loss/draw rates of team_a against team_b over sims battles."""
+    model = model or BattleModel(pokedex)
+    positions = team_positions([engine.resolve_team(pokedex, team_a), engine.resolve_team(pokedex, team_b)])
+    result = model.play(np.repeat(positions[:1], sims, axis=0), np.repeat(positions[1:], sims, axis=0),
+                        np.random.default_rng(seed))
+    return {"sims": sims, "win_rate": float((result > 0).mean()), "loss_rate": float((result < 0).mean()),
+            "draw_rate": float((result == 0).mean())}
+
+
+# Play one chunk of round-robin pairings inside a worker
+def run_pairs(job):
+    """Return (pairs, wins, draws) for a (pairs, sims, seed sequence) job over the worker's teams."""
+    pairs, sims, seed = job
+    a = np.repeat(_teams[pairs[:, 0]], sims, axis=0)
+    b = np.repeat(_teams[pairs[:, 1]], sims, axis=0)
+    result = _model.play(a, b, np.random.default_rng(seed)).reshape(len(pairs), sims)
+    return pairs, (result > 0).sum(axis=1), (result == 0).sum(axis=1)
+
+
+def round_robin(positions, sims=DEFAULT_SIMS, workers=None, seed=None, on_progress=None):
+    """Win-rate matrix for every pair of teams; workers=0 runs in-process.
+
+    positions is a (teams, 6) array from team_positions. rates[i, j] is the
+    share of battles team i won against team j, with draws counted as half;
+    rates[j, i] = 1 - rates[i, j] and the diagonal is 0.5. The same seed gives
+    the same matrix whatever the number of workers. on_progress(done, total) is
+    called after each chunk of pairings.
+    """
+    positions = np.asarray(positions, dtype=np.intp)
+    count = len(positions)
+    pairs = np.array(np.triu_indices(count, k=1)).T
+    step = max(1, BATCH_BATTLES // sims)
+    chunks = [pairs[i:i + step] for i in range(0, len(pairs), step)]
+    jobs = zip(chunks, [sims] * len(chunks), np.random.SeedSequence(seed).spawn(len(chunks)))
+
+    rates = np.full((count, count), 0.5)
+    done = 0
+    if workers == 0:
+        _set_teams(positions)
+        results = map(run_pairs, jobs)
+        pool = None
+    else:
+        pool = engine.process_pool(workers, _set_teams, (positions,))
+        results = pool.map(run_pairs, jobs)
+    try:
+        for chunk, wins, draws in results:
+            rate = (wins + 0.5 * draws) / sims
+            rates[chunk[:, 0], chunk[:, 1]] = rate
+            rates[chunk[:, 1], chunk[:, 0]] = 1 - rate
+            done += len(chunk)
+            if on_progress:
+                on_progress(done, len(pairs))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return rates
+
+
+def write_matrix(path, labels, rates):
+    """Write the win-rate matrix as CSV with team labels on both axes."""
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["team"] + labels)
+        for label, row in zip(labels, rates):
+            writer.writerow([label] + [f"{rate:.4f}" for rate in row])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate team-vs-team battles and build win-rate matrices.")
+    parser.add_argument("paths", nargs="+", help="save_team CSVs, directories of them, or batch output files")
+    parser.add_argument("--sims", type=int, default=DEFAULT_SIMS, help="battles per pairing")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (0: in-process)")
+    parser.add_argument("--top", type=int, default=10, help="teams to list by mean win rate")
+    parser.add_argument("-o", "--output", help="write the win-rate matrix CSV here")
+    args = parser.parse_args(argv)
+
+    pokedex = engine.load_pokedex()
+    labels, teams = [], []
+    for path in args.paths:
+        for label, names in read_library(path):
+            try:
+                teams.append(engine.resolve_team(pokedex, names))
+            except ValueError as e:
+                print(f"Skipping {label}: {e}", file=sys.stderr)
+                continue
+            labels.append(label)
+    if len(teams) < 2:
+        parser.error("Need at least two valid teams.")
+
+    def progress(done, total):
+        print(f"\r{done}/{total} pairings", end="", file=sys.stderr, flush=True)
+
+    started = time.perf_counter()
+    rates = round_robin(team_positions(teams), args.sims, args.workers, args.seed, progress)
+    elapsed = time.perf_counter() - started
+    battles = len(teams) * (len(teams) - 1) // 2 * args.sims
+    print(f"\n{battles:,} battles in {elapsed:.1f}s ({battles / max(elapsed, 1e-9):,.0f}/s)", file=sys.stderr)
+
+    if args.output:
+        write_matrix(args.output, labels, rates)
+    if len(teams) == 2:
+        print(f"{labels[0]} beats {labels[1]} {rates[0, 1]:.1%} of the time")
+        return
+    mean = (rates.sum(axis=1) - 0.5) / (len(teams) - 1)
+    for i in np.argsort(-mean, kind="stable")[:args.top]:
+        print(f"{mean[i]:6.1%}  {labels[i]}: {', '.join(pokemon.name for pokemon in teams[i])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Incrementally maintained team analysis.
+
+``TeamState`` keeps the aggregates behind ``engine.analyze_team`` up to date
+as members are added, removed or swapped, instead of rebuilding them from
+the whole team each time:
+
+* coverage counts: members hitting each defending type super-effectively
+* weakness / resistance counts: members taking more / less than neutral
+  damage from each attacking type, plus the product of their multipliers
+* stat totals and the strongest (attack) / weakest (defense) member
+
+Each change touches one member's precomputed pokedex rows (an 18-vector add
+or subtract) and one sorted entry per tracked stat, so the cost does not
+depend on the rest of the team. Each member's report section is rendered
+once when it joins.
+"""
+from bisect import insort
+
+import numpy as np
+
+from teambuilder.records import STAT_COLUMNS
+
+
+class TeamState:
+    """A team plus running aggregates, keyed by caller-chosen member keys (e.g. Treeview item ids)."""
+
+    def __init__(self, pokedex, team=()):
+        self._pokedex = pokedex
+        size = len(pokedex.type_matrix)
+        self.coverage_counts = np.zeros(size, dtype=np.int16)
+        self.weakness_counts = np.zeros(size, dtype=np.int16)
+        self.resistance_counts = np.zeros(size, dtype=np.int16)
+        self.immunity_counts = np.zeros(size, dtype=np.int16)
+        # Product of the non-zero multipliers; immunities are counted separately so removal can undo them
+        self._nonzero_product = np.ones(size)
+        self.stat_totals = dict.fromkeys(STAT_COLUMNS, 0)
+        # key -> (order, record, report section); order keeps slot order across swaps
+        self._members = {}
+        self._next_order = 0
+        # Sorted (−attack, order, key) / (defense, order, key) so ties go to the earliest slot like max()/min()
+        self._by_attack = []
+        self._by_defense = []
+        for pokemon in team:
+            self.add(pokemon)
+
+    def __len__(self):
+        return len(self._members)
+
+    def __contains__(self, key):
+        return key in self._members
+
+    def members(self):
+        """The team's records in slot order."""
+        return [record for _, record, _ in sorted(self._members.values(), key=lambda m: m[0])]
+
+    def keys(self):
+        return [key for key, _ in sorted(self._members.items(), key=lambda item: item[1][0])]
+
+    def _section(self, pokemon):
+        offense = self._pokedex.offense[pokemon.position]
+        types = self._pokedex.type_matrix.types
+        strong_against = [types[i] for i in np.flatnonzero(offense > 1)]
+        weak_against = [types[i] for i in np.flatnonzero(offense < 1)]
+        type2 = pokemon.type2
+        return (f"🔹 **{pokemon.name} ({pokemon.type1}{'/' + type2 if type2 else ''})**\n"
+                f"   - **Strong Against:** {', '.join(strong_against) if strong_against else 'None'}\n"
+                f"   - **Weak Against:** {', '.join(weak_against) if weak_against else 'None'}\n\n")
+
+    def _apply(self, key, order, pokemon, sign):
+        position = pokemon.position
+        defense = self._pokedex.defense[position]
+        self.coverage_counts += sign * (self._pokedex.coverage[position] > 1)
+        self.weakness_counts += sign * (defense > 1)
+        self.resistance_counts += sign * (defense < 1)
+        self.immunity_counts += sign * (defense == 0)
+        nonzero = np.where(defense == 0, 1.0, defense)
+        if sign > 0:
+            self._nonzero_product *= nonzero
+        else:
+            self._nonzero_product /= nonzero
+        for column in STAT_COLUMNS:
+            self.stat_totals[column] += sign * pokemon.stat(column)
+        attack_entry = (-pokemon.attack, order, key)
+        defense_entry = (pokemon.defense, order, key)
+        if sign > 0:
+            insort(self._by_attack, attack_entry)
+            insort(self._by_defense, defense_entry)
+        else:
+            self._by_attack.remove(attack_entry)
+            self._by_defense.remove(defense_entry)
+
+    # Add a member at the end of the team
+    def add(self, pokemon, key=None):
+        """Add a record and return its key (a new integer key unless one is given)."""
+        if key is None:
+            key = self._next_order
+        if key in self._members:
+            raise ValueError(f"Team already has a member with key {key!r}")
+        order = self._next_order
+        self._next_order += 1
+        self._members[key] = (order, pokemon, self._section(pokemon))
+        self._apply(key, order, pokemon, +1)
+        return key
+
+    def remove(self, key):
+        """Remove a member and return its record."""
+        order, pokemon, _ = self._members.pop(key)
+        self._apply(key, order, pokemon, -1)
+        return pokemon
+
+    def swap(self, key, pokemon):
+        """Replace a member in place (same slot and key); returns the old record."""
+        order, old, _ = self._members[key]
+        self._apply(key, order, old, -1)
+        self._members[key] = (order, pokemon, self._section(pokemon))
+        self._apply(key, order, pokemon, +1)
+        return old
+
+    def clear(self):
+        for key in list(self._members):
+            self.remove(key)
+        self._nonzero_product[:] = 1.0
+
+    @property
+    def defense_product(self):
+        """Combined multiplier the whole team takes from each attacking type."""
+        return np.where(self.immunity_counts > 0, 0.0, self._nonzero_product)
+
+    def strongest(self):
+        """Member with the highest attack (earliest slot on ties), or None."""
+        return self._members[self._by_attack[0][2]][1] if self._by_attack else None
+
+    def weakest(self):
+        """Member with the lowest defense (earliest slot on ties), or None."""
+        return self._members[self._by_defense[0][2]][1] if self._by_defense else None
+
+    def scores(self):
+        """Same keys as typechart.score_teams, for this one team."""
+        return {
+            "coverage": int((self.coverage_counts > 0).sum()),
+            "shared_weaknesses": int((self.weakness_counts >= 2).sum()),
+            "worst_weakness": int(self.weakness_counts.max()) if len(self) else 0,
+        }
+
+    # The engine.analyze_team text, assembled from the cached per-member sections
+    def report(self):
+        """Return the team analysis text; raises ValueError for an empty team."""
+        if not self._members:
+            raise ValueError("Team is empty.")
+        strongest, weakest = self.strongest(), self.weakest()
+        sections = [section for _, _, section in sorted(self._members.values(), key=lambda m: m[0])]
+        return (f"**Team Analysis & Stats**\n\n"
+                f"**Strongest Pokémon:** {strongest.name} (Attack: {strongest.attack})\n"
+                f"**Weakest Pokémon:** {weakest.name} (Defense: {weakest.defense})\n\n"
+                "**Team Type Effectiveness Analysis**\n\n" + "".join(sections))
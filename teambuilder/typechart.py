@@ -0,0 +1,111 @@
+"""Vectorized type effectiveness.
+
+``chart.csv`` is loaded once into an 18×18 NumPy matrix (attacking type on
+the rows, defending type on the columns) and every type gets an integer id.
+Species and teams are then plain id arrays, so multiplier vectors for the
+whole pokedex, or for thousands of teams at once, are single array ops.
+
+A missing or unknown type is encoded as ``NO_TYPE`` (-1), which indexes an
+extra neutral row/column of ones in the padded matrix.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+NO_TYPE = -1
+
+log = logging.getLogger(__name__)
+
+
+class TypeMatrix:
+    """The type chart as an array plus the type-name <-> id encoding."""
+
+    def __init__(self, type_chart):
+        self.types = list(type_chart.index)
+        self.ids = {t: i for i, t in enumerate(self.types)}
+        size = len(self.types)
+        # One extra row/column of ones so NO_TYPE (-1) is neutral in every lookup
+        self.padded = np.ones((size + 1, size + 1))
+        self.padded[:size, :size] = type_chart.loc[self.types, self.types].to_numpy(dtype=float)
+        self.values = self.padded[:size, :size]
+        # Transposed copy so defensive lookups are row gathers as well
+        self.defending = np.ascontiguousarray(self.padded.T)
+
+    def __len__(self):
+        return len(self.types)
+
+    # Encode type names (NaN/None/unknown -> NO_TYPE) as an id array
+    def encode(self, types):
+        """Return an int array of type ids for an iterable of type names."""
+        ids = np.full(len(types), NO_TYPE, dtype=np.int8)
+        for i, t in enumerate(types):
+            if isinstance(t, str) and t:
+                t = t.lower().strip()
+                if t in self.ids:
+                    ids[i] = self.ids[t]
+                else:
+                    log.warning("Type '%s' not found in type chart", t)
+        return ids
+
+    def offense(self, type1, type2):
+        """Product of both types' attacking rows: the rule used by the team report.
+
+        type1/type2 are id arrays of any shape; the result adds a trailing
+        axis of length 18 (one multiplier per defending type).
+        """
+        size = len(self.types)
+        return self.padded[type1, :size] * self.padded[type2, :size]
+
+    def defense(self, type1, type2):
+        """Damage multiplier taken from each attacking type (trailing axis of 18)."""
+        size = len(self.types)
+        return self.defending[type1, :size] * self.defending[type2, :size]
+
+    def coverage(self, type1, type2):
+        """Best multiplier either of the species' own types deals to each defending type."""
+        size = len(self.types)
+        type2 = np.where(np.asarray(type2) == NO_TYPE, type1, type2)
+        return np.maximum(self.padded[type1, :size], self.padded[type2, :size])
+
+
+# Per-team aggregates over id arrays shaped (..., members)
+def team_offense(type_matrix, type1, type2):
+    """Best multiplier any member's own type deals to each defending type: (..., 18)."""
+    return type_matrix.coverage(type1, type2).max(axis=-2)
+
+
+def team_weakness_counts(type_matrix, type1, type2):
+    """Number of members taking super-effective damage from each attacking type: (..., 18)."""
+    return (type_matrix.defense(type1, type2) > 1).sum(axis=-2)
+
+
+def score_teams(type_matrix, type1, type2):
+    """Score a batch of teams given (teams, members) id arrays.
+
+    Returns a dict of arrays, one entry per team: 'coverage' (defending types
+    hit super-effectively), 'shared_weaknesses' (attacking types that hit two
+    or more members super-effectively) and 'worst_weakness' (largest number
+    of members weak to a single type).
+    """
+    offense = team_offense(type_matrix, type1, type2)
+    weak = team_weakness_counts(type_matrix, type1, type2)
+    return {
+        "coverage": (offense > 1).sum(axis=-1),
+        "shared_weaknesses": (weak >= 2).sum(axis=-1),
+        "worst_weakness": weak.max(axis=-1),
+    }
+
+
+# Strong/weak type lists for each member, built from the vectorized offense rows
+def strong_weak_lists(type_matrix, type1, type2):
+    """Return [(strong_against, weak_against), ...] for 1-D id arrays."""
+    offense = type_matrix.offense(type1, type2)
+    types = np.array(type_matrix.types)
+    return [(types[row > 1].tolist(), types[row < 1].tolist()) for row in offense]
+
+
+def encode_frame(type_matrix, df):
+    """Return (type1_ids, type2_ids) arrays for a DataFrame with type1/type2 columns."""
+    type2 = df['type2'] if 'type2' in df.columns else pd.Series([None] * len(df))
+    return type_matrix.encode(list(df['type1'])), type_matrix.encode(list(type2))
@@ -0,0 +1,8 @@
+import pytest
+
+from teambuilder import engine
+
+
+@pytest.fixture(scope="session")
+def pokedex():
+    return engine.shared_pokedex()
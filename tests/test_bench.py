@@ -0,0 +1,19 @@
+import pytest
+
+from teambuilder import bench
+
+
+def summary(p50, ops):
+    return {"calls": 10, "p50_us": p50, "p90_us": p50, "p99_us": p50, "max_us": p50, "ops_per_sec": ops}
+
+
+def test_compare_flags_slower_cases():
+    baseline = {"quick": False, "results": {"fast": summary(10.0, 100.0), "slow": summary(10.0, 100.0)}}
+    results = {"fast": summary(10.5, 95.0), "slow": summary(20.0, 50.0)}
+    assert [case for case, *_ in bench.compare(results, baseline)] == ["slow", "slow"]
+
+
+def test_compare_refuses_other_mode():
+    baseline = {"quick": False, "results": {"case": summary(10.0, 100.0)}}
+    with pytest.raises(ValueError):
+        bench.compare({"case": summary(10.0, 100.0)}, baseline, quick=True)
@@ -0,0 +1,109 @@
+import logging
+import pickle
+import threading
+
+from teambuilder import data
+
+
+def test_concurrent_cache_writes(tmp_path):
+    cache = tmp_path / "pokedex.cache.pkl"
+    snapshot = {"version": data.CACHE_VERSION, "payload": list(range(10_000))}
+    errors = []
+
+    def write():
+        try:
+            for _ in range(20):
+                data._replace(cache, snapshot)
+        except Exception as e:  # collected and asserted below
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert [p.name for p in tmp_path.iterdir()] == [cache.name]
+
+
+def test_concurrent_rebuilds_after_touch(tmp_path):
+    sources = _copy_sources(tmp_path)
+    cache = tmp_path / "cache.pkl"
+    errors = []
+
+    def load():
+        try:
+            assert len(data.load_snapshot(cache, **sources)["pokemon"])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=load) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+def test_custom_sources_load_one_snapshot(tmp_path, monkeypatch):
+    from teambuilder import engine
+
+    shared = tmp_path / "pokedex.cache.pkl"
+    monkeypatch.setattr(data, "CACHE_PATH", shared)
+    builds = []
+    build_cache = data.build_cache
+    monkeypatch.setattr(data, "build_cache", lambda *args: builds.append(args) or build_cache(*args))
+    chart = tmp_path / "chart.csv"
+    chart.write_bytes(data.CHART_CSV.read_bytes())
+
+    pokedex = engine.load_pokedex(chart_path=chart)
+    assert len(pokedex.records) and len(builds) == 1
+    assert not shared.exists()
+    assert data.cache_path_for(chart_path=chart).exists()
+    engine.load_pokedex(chart_path=chart)
+    assert len(builds) == 1
+
+
+class _FailsToLoad:
+    # Unpickling calls int("x"), a ValueError like a frame from an incompatible pandas
+    def __reduce__(self):
+        return int, ("x",)
+
+
+def _copy_sources(tmp_path):
+    sources = {}
+    for key, path in (("pokemon_path", data.POKEMON_CSV), ("evols_path", data.EVOLS_XLSX),
+                      ("chart_path", data.CHART_CSV)):
+        sources[key] = tmp_path / path.name
+        sources[key].write_bytes(path.read_bytes())
+    return sources
+
+
+def test_unreadable_or_stale_cache_is_rebuilt(tmp_path, monkeypatch):
+    sources = _copy_sources(tmp_path)
+    cache = tmp_path / "cache.pkl"
+    cache.write_bytes(pickle.dumps(_FailsToLoad()))
+    assert len(data.load_snapshot(cache, **sources)["pokemon"])
+    assert pickle.loads(cache.read_bytes())["libraries"] == data._libraries()
+
+    builds = []
+    build_cache = data.build_cache
+    monkeypatch.setattr(data, "build_cache", lambda *args: builds.append(args) or build_cache(*args))
+    data.load_snapshot(cache, **sources)
+    assert not builds
+    monkeypatch.setattr(data, "_libraries", lambda: {"pandas": "0.0", "numpy": "0.0"})
+    data.load_snapshot(cache, **sources)
+    assert len(builds) == 1
+
+
+def test_unwritable_cache_falls_back_to_memory(tmp_path, monkeypatch, caplog):
+    sources = _copy_sources(tmp_path)
+
+    def read_only(cache_path, snapshot):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(data, "_replace", read_only)
+    with caplog.at_level(logging.WARNING, logger="teambuilder.data"):
+        snapshot = data.load_snapshot(tmp_path / "cache.pkl", **sources)
+    assert len(snapshot["pokemon"]) and "Could not write" in caplog.text
+    assert not (tmp_path / "cache.pkl").exists()
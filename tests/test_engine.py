@@ -0,0 +1,28 @@
+import pytest
+
+from teambuilder import engine, search
+
+
+def test_parse_types():
+    assert engine.parse_types(None) == []
+    assert engine.parse_types(" Fire; ;WATER ") == ["fire", "water"]
+    assert engine.parse_types(["Grass", " "]) == ["grass"]
+    assert engine.normalize_types("fire") == frozenset({"fire"})
+
+
+def test_type_bits_match_type_ids(pokedex):
+    for position in (0, 5, 24, 400, len(pokedex.records) - 1):
+        ids = {int(t) for t in (pokedex.type1_ids[position], pokedex.type2_ids[position]) if t >= 0}
+        assert int(pokedex.type_bits[position]) == sum(1 << t for t in ids)
+
+
+def test_normalize_stat_rejects_unknown_columns(pokedex):
+    assert engine.normalize_stat(" Attack ") == "attack"
+    assert engine.normalize_stat("none") is None and engine.normalize_stat(None) is None
+    for stat in ("bogus", "name"):
+        with pytest.raises(ValueError, match="choose one of"):
+            engine.normalize_stat(stat)
+    with pytest.raises(ValueError, match="choose one of"):
+        engine.generate_team(pokedex, 1, 50, prioritized_stat="name")
+    with pytest.raises(ValueError, match="choose one of"):
+        search.optimize_team(pokedex, 1, 50, prioritized_stat="bogus")
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from teambuilder.jobs import JobRunner
+
+
+def wait_for(runner, action):
+    for _ in range(500):
+        if not runner.running(action):
+            return
+        runner.poll()
+        time.sleep(0.002)
+    raise AssertionError(f"{action} never finished")
+
+
+def test_failing_callback_does_not_stop_delivery():
+    runner = JobRunner()
+    delivered = []
+    try:
+        runner.submit("bad", lambda: 1, on_done=lambda result: 1 / 0)
+        wait_for(runner, "bad")
+        runner.submit("good", lambda: 2, on_done=delivered.append)
+        wait_for(runner, "good")
+        assert delivered == [2]
+    finally:
+        runner.shutdown()
+
+
+def test_cancelled_action_stays_busy_until_it_finishes():
+    runner = JobRunner()
+    release = threading.Event()
+    delivered = []
+    try:
+        assert runner.submit("optimize", release.wait, on_done=delivered.append)
+        while not runner._jobs["optimize"][0].running():
+            time.sleep(0.001)
+        assert runner.cancel("optimize") == ["optimize"]
+        assert runner.cancelling("optimize")
+        assert not runner.submit("optimize", lambda: 1, on_done=delivered.append)
+
+        release.set()
+        while runner.cancelling("optimize"):
+            time.sleep(0.001)
+        assert runner.submit("optimize", lambda: 1, on_done=delivered.append)
+        wait_for(runner, "optimize")
+        assert delivered == [1]
+    finally:
+        runner.shutdown()
+
+
+def test_running_job_does_not_keep_the_process_alive():
+    script = ("import threading; from teambuilder.jobs import JobRunner; runner = JobRunner(); "
+              "runner.submit('optimize', threading.Event().wait, on_done=print); "
+              "runner.submit('sample', threading.Event().wait, on_done=print); "
+              "runner.submit('swap', threading.Event().wait, on_done=print); runner.shutdown()")
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=30,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert time.perf_counter() - started < 10
+
+
+def test_shutdown_cancels_queued_jobs():
+    runner = JobRunner(max_workers=1)
+    release = threading.Event()
+    runner.submit("optimize", release.wait, on_done=print)
+    runner.submit("sample", lambda: 1, on_done=print)
+    queued = runner._jobs["sample"][0]
+    runner.shutdown()
+    release.set()
+    assert queued.cancelled()
@@ -0,0 +1,21 @@
+from teambuilder import engine
+from teambuilder.library import LibraryStats
+from teambuilder.typechart import strong_weak_lists
+
+
+def test_counts_follow_the_team_report(pokedex):
+    names = [["Charizard", "Gyarados", "Venusaur"], ["Pikachu"],
+             ["Mew", "Snorlax", "Gengar", "Dragonite", "Starmie", "Alakazam"]]
+    teams = [engine.resolve_team(pokedex, team) for team in names]
+    results = LibraryStats(pokedex).add_chunk([[pokemon.position for pokemon in team] for team in teams])
+    for team, result in zip(teams, results):
+        type1 = [pokemon.type1_id for pokemon in team]
+        type2 = [pokemon.type2_id for pokemon in team]
+        lists = strong_weak_lists(pokedex.type_matrix, type1, type2)
+        strong = set().union(*(set(s) for s, _ in lists))
+        weak_counts = {t: sum(t in w for _, w in lists) for t in pokedex.type_matrix.types}
+        assert result["strong_coverage"] == len(strong)
+        assert set(result["gaps"]) == set(pokedex.type_matrix.types) - strong
+        assert result["shared_weak_against"] == sum(count >= 2 for count in weak_counts.values())
+        assert result["worst_weak_against"] == max(weak_counts.values())
+    assert results[0]["strong_coverage"] == 8
@@ -0,0 +1,28 @@
+import numpy as np
+
+from teambuilder.matchups import MatchupTable
+from teambuilder.typechart import NO_TYPE
+
+
+def test_reconciled_defense_matches_type_matrix(pokedex):
+    table = pokedex.matchups
+    assert np.allclose(table.defense, pokedex.type_matrix.defense(pokedex.type1_ids, pokedex.type2_ids))
+    assert len(table.mismatches) == 95
+    assert "Raichu" in table.mismatched_species()
+
+
+def test_hit_rows_slice_the_chart(pokedex):
+    # hit[a, b]: the best multiplier either of a's own types deals to species b
+    chart_defense = pokedex.type_matrix.defense(pokedex.type1_ids, pokedex.type2_ids)
+    for a in (0, 24, 93, 148, 500):
+        own = [t for t in (pokedex.type1_ids[a], pokedex.type2_ids[a]) if t != NO_TYPE]
+        assert np.allclose(pokedex.matchups.hit[a], chart_defense[:, own].max(axis=1))
+
+
+def test_missing_types_hit_neutrally(pokedex):
+    df = pokedex.df.iloc[:3]
+    type1 = np.array([NO_TYPE, NO_TYPE, pokedex.type1_ids[2]], dtype=np.int8)
+    type2 = np.array([NO_TYPE, pokedex.type1_ids[2], NO_TYPE], dtype=np.int8)
+    table = MatchupTable(df, pokedex.type_matrix, type1, type2, pokedex.defense[:3])
+    assert np.all(table.hit[0] == 1.0)
+    assert np.array_equal(table.hit[1], table.hit[2])
@@ -0,0 +1,41 @@
+from teambuilder.names import NameIndex
+
+NAMES = ["Pikachu", "Raichu", "Pichu", "Mr. Mime", "Mime Jr.", "Flabébé", "Pidgey", "Pidgeotto", "Pidgeot", "Pinsir"]
+
+
+def _names(index, positions):
+    return [index.names[i] for i in positions]
+
+
+def test_lookup_is_exact_and_accent_insensitive():
+    index = NameIndex(NAMES)
+    assert index.lookup(" PIKACHU ") == NAMES.index("Pikachu")
+    assert index.lookup("flabebe") == index.lookup("Flabébé") == NAMES.index("Flabébé")
+    assert index.lookup("pika") is None
+
+
+def test_complete_orders_whole_names_by_length_then_word_starts():
+    index = NameIndex(NAMES)
+    assert _names(index, index.complete("pi")) == ["Pichu", "Pidgey", "Pinsir", "Pidgeot", "Pikachu", "Pidgeotto"]
+    assert _names(index, index.complete("pi", limit=3)) == ["Pichu", "Pidgey", "Pinsir"]
+    # "Mime Jr." starts with the prefix, "Mr. Mime" only has a word that does
+    assert _names(index, index.complete("mime")) == ["Mime Jr.", "Mr. Mime"]
+    assert index.complete("") == []
+
+
+def test_search_ranks_exact_then_prefix_then_typos():
+    index = NameIndex(NAMES)
+    results = index.search("pidgey")
+    assert results[0] == (NAMES.index("Pidgey"), 1.0)
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert len(index.search("pi", limit=2)) == 2
+    assert index.search("") == [] and index.search("zzzz") == []
+
+
+def test_search_forgives_one_typo(pokedex):
+    index = pokedex.name_search
+    for typo in ("pikachuu", "pikacu", "pikqchu"):
+        position, score = index.search(typo)[0]
+        assert index.names[position] == "Pikachu" and 0 < score < 1
+    assert index.names[index.search("flabebe")[0][0]] == "Flabébé"
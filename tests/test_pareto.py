@@ -0,0 +1,66 @@
+import numpy as np
+
+from teambuilder import engine, pareto
+
+EXCLUDED = ["normal", "water", "psychic", "poison", "bug"]
+
+
+def exact_front(pokedex, pool):
+    """Objective vectors of the true front, by enumerating every type-disjoint team of pool."""
+    vectors = pareto.species_vectors(pokedex, pool)
+    type_bits = vectors["types"]
+    teams = []
+
+    def extend(start, chosen, used):
+        if len(chosen) == engine.TEAM_SIZE:
+            teams.append(tuple(chosen))
+            return
+        for i in range(start, len(pool)):
+            if not type_bits[i] & used:
+                chosen.append(i)
+                extend(i + 1, chosen, used | int(type_bits[i]))
+                chosen.pop()
+
+    extend(0, [], 0)
+    teams = np.array(teams)
+    cover = np.bitwise_or.reduce(vectors["cover"][teams], axis=1)
+    objectives = np.column_stack([vectors["stats"][teams].sum(axis=1), pareto._bit_count(cover)])
+    return {tuple(row) for row in objectives[pareto.nondominated(objectives)].tolist()}
+
+
+def test_nondominated_matches_pairwise_check():
+    values = np.random.default_rng(5).integers(0, 6, size=(600, 3))
+    kept = set(pareto.nondominated(values).tolist())
+    for i, row in enumerate(values):
+        dominated = any((other >= row).all() and ((other > row).any() or j < i)
+                        for j, other in enumerate(values) if j != i)
+        assert (i in kept) == (not dominated)
+
+
+def test_wide_beam_finds_the_exact_front(pokedex):
+    exact = exact_front(pokedex, engine.candidate_pool(pokedex, 1, 100, None, EXCLUDED))
+    front = pareto.pareto_front(pokedex, 1, 100, excluded_types=EXCLUDED, beam_width=1024)
+    found = [tuple(entry["objectives"]) for entry in front["teams"]]
+    assert len(found) == len(set(found))
+    assert set(found) <= exact
+    assert len(found) >= 0.99 * len(exact)
+
+
+def test_untruncated_front_is_exact(pokedex):
+    exact = exact_front(pokedex, engine.candidate_pool(pokedex, 1, 100, None, EXCLUDED))
+    front = pareto.pareto_front(pokedex, 1, 100, excluded_types=EXCLUDED, beam_width=4096)
+    assert not front["stats"]["truncated"]
+    found = [tuple(entry["objectives"]) for entry in front["teams"]]
+    assert len(found) == len(exact) and set(found) == exact
+
+
+def test_narrow_beam_reports_truncation(pokedex):
+    front = pareto.pareto_front(pokedex, 1, 100, excluded_types=EXCLUDED, beam_width=64)
+    assert front["stats"]["truncated"] and len(front["teams"]) <= 64
+
+
+def test_nondominated_with_masks_keeps_smaller_type_sets():
+    values = np.array([[5, 5], [5, 5], [4, 4]])
+    # Row 1 uses a subset of row 0's types, so it dominates row 0; row 2 uses disjoint types
+    assert sorted(pareto.nondominated(values, np.array([0b11, 0b01, 0b100])).tolist()) == [1, 2]
+    assert pareto.nondominated(values).tolist() == [0]
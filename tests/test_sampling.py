@@ -0,0 +1,25 @@
+from teambuilder import sampling
+from teambuilder.records import PokemonRecord
+
+
+def test_sample_team_returns_one_team(pokedex):
+    team = sampling.sample_team(pokedex, 1, 50, seed=7)
+    assert 0 < len(team) <= 6
+    assert all(isinstance(pokemon, PokemonRecord) for pokemon in team)
+
+
+def test_same_seed_same_teams(pokedex):
+    first = sampling.sample_teams(pokedex, 5, 1, 50, seed=3)
+    second = sampling.sample_teams(pokedex, 5, 1, 50, seed=3)
+    assert [[p.name for p in team] for team in first] == [[p.name for p in team] for team in second]
+
+
+def test_members_share_no_type(pokedex):
+    for team in sampling.sample_teams(pokedex, 200, 4, 100, seed=1):
+        types = [t for pokemon in team for t in set(pokemon.types())]
+        assert len(types) == len(set(types))
+
+
+def test_empty_pool_gives_no_teams(pokedex):
+    assert sampling.sample_teams(pokedex, 5, 8, 50, seed=1) == []
+    assert sampling.sample_team(pokedex, 8, 50, seed=1) == []
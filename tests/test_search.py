@@ -0,0 +1,44 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from teambuilder import engine, search
+
+EXCLUDED = ["normal", "water", "grass", "bug", "flying", "poison"]
+
+
+def brute_force_best(pokedex, pool, stat, preferred_types):
+    """Best score of every valid six-member team of pool, scored from the pokedex tables."""
+    combos = np.array(list(combinations(range(len(pool)), engine.TEAM_SIZE)), dtype=np.intp)
+    members = pool[combos]
+    type_bits = pokedex.type_bits[members]
+    preferred = pokedex.rows_with_types(preferred_types)[members]
+    valid = np.ones(len(combos), dtype=bool)
+    for a, b in combinations(range(engine.TEAM_SIZE), 2):
+        shared = (type_bits[:, a] & type_bits[:, b]) != 0
+        valid &= ~shared | (preferred[:, a] & preferred[:, b])
+    stats = pokedex.records.column(stat).astype(float)
+    n_types = len(pokedex.type_matrix)
+    score = (stats[members].sum(axis=1) / (stats[pool].max() * engine.TEAM_SIZE)
+             + (pokedex.coverage[members] > 1).any(axis=1).sum(axis=1) / n_types
+             - ((pokedex.defense[members] > 1).sum(axis=1) >= 2).sum(axis=1) / n_types)
+    return score[valid].max()
+
+
+@pytest.mark.parametrize("generation, max_level, stat, preferred_types", [
+    (2, 100, "base_total", []),
+    (2, 20, "attack", []),
+    (2, 100, "speed", ["fire"]),
+])
+def test_optimizer_matches_brute_force(pokedex, generation, max_level, stat, preferred_types):
+    result = search.optimize_team(pokedex, generation, max_level, stat, preferred_types, EXCLUDED)
+    pool = engine.candidate_pool(pokedex, generation, max_level, stat, EXCLUDED)
+    assert result["stats"]["complete"] and len(result["team"]) == engine.TEAM_SIZE
+    assert result["score"] == pytest.approx(brute_force_best(pokedex, pool, stat, preferred_types))
+
+
+def test_pruned_counts_only_branches_a_bound_cut(pokedex):
+    # With every weight zero the greedy seed is already optimal, so the root's bound cuts its one subtree
+    flat = search.optimize_team(pokedex, 1, 100, weights={"stat": 0, "coverage": 0, "weakness": 0})
+    assert flat["stats"]["nodes_expanded"] == 1 and flat["stats"]["nodes_pruned"] == 1
@@ -0,0 +1,67 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from teambuilder import server
+
+
+@pytest.fixture
+def service(pokedex):
+    return server.TeamService()
+
+
+def post(service, path, body):
+    return asyncio.run(service.dispatch("POST", path, json.dumps(body).encode("utf-8")))
+
+
+@pytest.mark.parametrize("key, value", [
+    ("excluded_types", "fire"),
+    ("preferred_types", ["fire", 3]),
+    ("locked_team", "Pikachu"),
+    ("prioritized_stat", 5),
+    ("generation", "1"),
+    ("max_level", "abc"),
+    ("max_level", True),
+    ("count", 2.5),
+    ("seed", "7"),
+])
+def test_generate_rejects_malformed_filters(service, key, value):
+    with pytest.raises(server.RequestError) as error:
+        post(service, "/generate", {"generation": 1, "max_level": 50, key: value})
+    assert error.value.status == HTTPStatus.BAD_REQUEST
+    assert repr(key) in str(error.value)
+
+
+def test_analyze_rejects_team_string(service):
+    with pytest.raises(server.RequestError):
+        post(service, "/analyze", {"team": "Pikachu"})
+
+
+def test_type_filters_ignore_case(service):
+    status, result = post(service, "/generate", {"generation": 1, "max_level": 100, "excluded_types": ["FIRE", " Water"]})
+    assert status == HTTPStatus.OK and result["team"]
+    types = {row[column] for row in result["team"] for column in ("Type 1", "Type 2")}
+    assert not {str(t).lower() for t in types} & {"fire", "water"}
+
+
+def test_sample_with_empty_pool(service):
+    status, result = post(service, "/generate", {"generation": 8, "max_level": 50, "mode": "sample", "count": 5})
+    assert result == {"teams": []}
+
+
+@pytest.mark.parametrize("body", [{"generation": 1, "max_level": None}, {"generation": 1}])
+def test_generate_requires_generation_and_level(service, body):
+    with pytest.raises(server.RequestError, match="required integers"):
+        post(service, "/generate", body)
+
+
+def test_swap_requires_integer_slot(service):
+    body = {"team": ["Pikachu", "Onix"], "generation": 1, "max_level": 50}
+    with pytest.raises(server.RequestError, match="'slot' is required"):
+        post(service, "/swap", body)
+    with pytest.raises(server.RequestError, match="'slot' must be an integer"):
+        post(service, "/swap", dict(body, slot="1"))
+    status, result = post(service, "/swap", dict(body, slot=1))
+    assert status == HTTPStatus.OK
@@ -0,0 +1,13 @@
+import numpy as np
+
+from teambuilder import sampling, simulate
+
+
+def test_round_robin_is_reproducible_across_worker_counts(pokedex):
+    teams = simulate.team_positions(sampling.sample_teams(pokedex, 8, 1, 100, seed=5))
+    # 28 pairings in chunks of BATCH_BATTLES // sims = 10, so the seed is split over several jobs
+    in_process = simulate.round_robin(teams, sims=5000, workers=0, seed=11)
+    assert np.array_equal(in_process, simulate.round_robin(teams, sims=5000, workers=0, seed=11))
+    assert np.array_equal(in_process, simulate.round_robin(teams, sims=5000, workers=2, seed=11))
+    assert np.allclose(in_process + in_process.T, 1)
+    assert not np.array_equal(in_process, simulate.round_robin(teams, sims=5000, workers=0, seed=12))
@@ -0,0 +1,42 @@
+import random
+
+import numpy as np
+import pytest
+
+from teambuilder import engine
+from teambuilder.teamstate import TeamState
+from teambuilder.typechart import score_teams
+
+
+def assert_matches_rebuild(pokedex, state):
+    team = state.members()
+    rebuilt = TeamState(pokedex, team)
+    for name in ("coverage_counts", "weakness_counts", "resistance_counts", "immunity_counts"):
+        assert np.array_equal(getattr(state, name), getattr(rebuilt, name)), name
+    assert state.defense_product == pytest.approx(rebuilt.defense_product)
+    assert state.stat_totals == rebuilt.stat_totals
+    assert state.strongest() is rebuilt.strongest() and state.weakest() is rebuilt.weakest()
+    if not team:
+        return
+    assert state.report() == engine.analyze_team(team, pokedex.type_matrix)
+    type1 = np.array([[pokemon.type1_id for pokemon in team]], dtype=np.int8)
+    type2 = np.array([[pokemon.type2_id for pokemon in team]], dtype=np.int8)
+    assert state.scores() == {key: int(values[0]) for key, values in score_teams(pokedex.type_matrix, type1, type2).items()}
+
+
+def test_incremental_updates_match_full_rebuild(pokedex):
+    rng = random.Random(13)
+    records = pokedex.records.take(range(len(pokedex.records)))
+    state = TeamState(pokedex)
+    for step in range(3000):
+        keys = state.keys()
+        action = rng.random()
+        if action < 0.01:
+            state.clear()
+        elif not keys or (len(keys) < engine.TEAM_SIZE and action < 0.45):
+            state.add(rng.choice(records), key=f"item{step}")
+        elif action < 0.7:
+            state.remove(rng.choice(keys))
+        else:
+            state.swap(rng.choice(keys), rng.choice(records))
+        assert_matches_rebuild(pokedex, state)